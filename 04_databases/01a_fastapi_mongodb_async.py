@@ -0,0 +1,243 @@
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional
+
+from bson.objectid import ObjectId
+from fastapi import FastAPI, Query
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+# Only the fields we send back to the client
+TODO_PROJECTION = {"title": 1, "description": 1, "status": 1, "created_at": 1}
+
+
+class Todo(BaseModel):
+    title: str
+    description: str
+    status: str
+
+
+# One client (and one connection pool) shared by every request
+client = AsyncIOMotorClient(
+    os.getenv("DB_URI"),
+    maxPoolSize=int(os.getenv("DB_MAX_POOL_SIZE", "50")),
+    minPoolSize=int(os.getenv("DB_MIN_POOL_SIZE", "5")),
+    maxIdleTimeMS=60_000,
+    serverSelectionTimeoutMS=5_000,
+)
+db = client["fastapidb"]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Index used by /fetch_todo_by_title
+    await db.todos.create_index([("title", ASCENDING)])
+    print("Connected to the database")
+    yield
+    client.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def serialize(todo):
+    return {
+        "id": str(todo["_id"]),
+        "title": todo["title"],
+        "description": todo["description"],
+        "status": todo["status"],
+        "created_at": todo["created_at"],
+    }
+
+
+@app.get("/")
+async def read_root():
+    return {"status": "Server is running"}
+
+
+@app.get("/todos")
+async def read_todos(limit: int = Query(50, ge=1, le=500), after: Optional[str] = None):
+    # Keyset pagination: pass the "next" id from the previous page as ?after=
+    try:
+        query = {"_id": {"$gt": ObjectId(after)}} if after else {}
+        cursor = db.todos.find(query, TODO_PROJECTION).sort("_id", ASCENDING).limit(limit)
+        listTodos = [serialize(todo) async for todo in cursor]
+        return {
+            "data": listTodos,
+            "next": listTodos[-1]["id"] if len(listTodos) == limit else None,
+            "error": None,
+            "message": "Todos read successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error reading todos: {e}")
+        return {
+            "data": [],
+            "error": "Error reading todos",
+            "message": str(e),
+            "status": "failed"
+            }
+
+
+@app.get("/todos/stream")
+async def stream_todos():
+    # Sends the whole collection as a JSON array without loading it into memory
+    async def generate():
+        yield '{"data": ['
+        first = True
+        async for todo in db.todos.find({}, TODO_PROJECTION, batch_size=1000):
+            yield ("" if first else ",") + json.dumps(serialize(todo))
+            first = False
+        yield '], "error": null, "message": "Todos read successfully", "status": "success"}'
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+@app.get("/todos/{id}")
+async def read_todo_by_id(id: str):
+    try:
+        todo = await db.todos.find_one({"_id": ObjectId(id)}, TODO_PROJECTION)
+        if todo is None:
+            return {
+                "data": {},
+                "error": "Todo not found",
+                "message": "Todo not found",
+                "status": "failed"
+                }
+        return {
+            "data": serialize(todo),
+            "error": None,
+            "message": "Todo read successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error reading todo: {e}")
+        return {
+            "data": {},
+            "error": "Error reading todo",
+            "message": str(e),
+            "status": "failed"
+            }
+
+
+@app.get("/fetch_todo_by_title")
+async def read_todo_by_title(title: str):
+    try:
+        todo = await db.todos.find_one({"title": title}, TODO_PROJECTION)
+        if todo is None:
+            return {
+                "data": {},
+                "error": "Todo not found",
+                "message": "Todo not found",
+                "status": "failed"
+                }
+        return {
+            "data": serialize(todo),
+            "error": None,
+            "message": "Todo read successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error reading todo: {e}")
+        return {
+            "data": {},
+            "error": "Error reading todo",
+            "message": str(e),
+            "status": "failed"
+            }
+
+
+@app.post("/create_todo")
+async def create_todo(todo: Todo):
+    try:
+        result = await db.todos.insert_one({
+            "title": todo.title,
+            "description": todo.description,
+            "status": todo.status,
+            "created_at": str(datetime.now())
+        })
+        return {
+            "data": {"id": str(result.inserted_id)},
+            "error": None,
+            "message": "Todo created successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error creating todo: {e}")
+        return {
+            "data": {},
+            "error": "Error creating todo",
+            "message": str(e),
+            "status": "failed"
+            }
+
+
+@app.delete("/delete_todo/{id}")
+async def delete_todo(id: str):
+    try:
+        result = await db.todos.delete_one({"_id": ObjectId(id)})
+        if result.deleted_count == 0:
+            return {
+                "data": {},
+                "error": "Todo not found",
+                "message": "Todo not found",
+                "status": "failed"
+                }
+        return {
+            "data": {},
+            "error": None,
+            "message": "Todo deleted successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error deleting todo: {e}")
+        return {
+            "data": {},
+            "error": "Error deleting todo",
+            "message": str(e),
+            "status": "failed"
+            }
+
+
+@app.put("/update_todo/{id}")
+async def update_todo(id: str, todo: Todo):
+    try:
+        result = await db.todos.update_one(
+            {"_id": ObjectId(id)},
+            {
+                "$set": {
+                    "title": todo.title,
+                    "description": todo.description,
+                    "status": todo.status
+                }
+            }
+        )
+        if result.matched_count == 0:
+            return {
+                "data": {},
+                "error": "Todo not found",
+                "message": "Todo not found",
+                "status": "failed"
+                }
+        return {
+            "data": {},
+            "error": None,
+            "message": "Todo updated successfully",
+            "status": "success"
+            }
+    except Exception as e:
+        print(f"Error updating todo: {e}")
+        return {
+            "data": {},
+            "error": "Error updating todo",
+            "message": str(e),
+            "status": "failed"
+            }
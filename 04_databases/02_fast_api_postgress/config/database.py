@@ -1,10 +1,29 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# Pool settings (shared by the sync and the async engine)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# Set USE_ASYNC_DB=1 to serve the routes with async handlers and asyncpg
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "0") == "1"
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT,
+    pool_recycle=POOL_RECYCLE,
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -12,4 +31,54 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def async_database_url(url):
+    # postgresql://... or postgresql+psycopg2://... -> postgresql+asyncpg://...
+    # asyncpg calls the sslmode option "ssl" and does not know channel_binding
+    parts = urlsplit(url)
+    query = [
+        ("ssl" if key == "sslmode" else key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key != "channel_binding"
+    ]
+    return urlunsplit(parts._replace(scheme="postgresql+asyncpg", query=urlencode(query)))
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if USE_ASYNC_DB:
+    async_engine = create_async_engine(
+        async_database_url(DATABASE_URL),
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+        # asyncpg prepares each statement once per connection and reuses it
+        connect_args={"prepared_statement_cache_size": STATEMENT_CACHE_SIZE},
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession,
+                                           autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats():
+    pool = async_engine.pool if USE_ASYNC_DB else engine.pool
+    checked_out = pool.checkedout()
+    capacity = POOL_SIZE + MAX_OVERFLOW
+    return {
+        "mode": "async" if USE_ASYNC_DB else "sync",
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "max_connections": capacity,
+        "utilization": round(checked_out / capacity, 2),
+    }
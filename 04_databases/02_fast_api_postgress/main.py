@@ -1,9 +1,16 @@
 from fastapi import FastAPI
 from dotenv import load_dotenv
-from routes import todo_routes, user_routes
 
+# Load .env before config.database reads DATABASE_URL and USE_ASYNC_DB
 load_dotenv()
 
+from config.database import USE_ASYNC_DB, pool_stats
+
+if USE_ASYNC_DB:
+    from routes import async_todo_routes as todo_routes, async_user_routes as user_routes
+else:
+    from routes import todo_routes, user_routes
+
 
 app = FastAPI()
 
@@ -11,6 +18,11 @@ app.include_router(todo_routes.todo_router, prefix="/todos", tags=["Todo"])
 app.include_router(user_routes.user_router, prefix="/users", tags=["User"])
 
 
+@app.get("/pool_stats")
+def get_pool_stats():
+    return pool_stats()
+
+
 
 # uv run alembic revision --autogenerate -m "create todos table"
 # uv run alembic upgrade head
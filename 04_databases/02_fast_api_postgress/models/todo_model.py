@@ -6,7 +6,7 @@ from sqlalchemy.orm import relationship
 Base = declarative_base()
 
 
-from sqlalchemy import Column, Integer, String, Boolean,CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean,CheckConstraint,Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -40,4 +40,7 @@ class Todos(Base):
     title = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     completed = Column(Boolean, default=False)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
\ No newline at end of file
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Backs "todos of one user, ordered by id" (keyset pagination and bulk updates)
+    __table_args__ = (Index('ix_todos_user_id_id', 'user_id', 'id'),)
\ No newline at end of file
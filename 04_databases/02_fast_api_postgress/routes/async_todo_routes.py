@@ -0,0 +1,216 @@
+from typing import Optional
+from config.database import get_async_db
+from fastapi import APIRouter,Depends,HTTPException,Query
+from models.todo_model import Todos
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from routes.todo_routes import ids_param
+from utils.auth_utils import verify_token
+from validations.validation import TodoBulkCreate, TodoBulkIds, TodoBulkUpdate, TodoCreate
+
+# Same endpoints as todo_routes, but async so no threadpool worker is held
+# while waiting for Postgres
+todo_router = APIRouter()
+
+@todo_router.post("/create")
+async def create_todo(todo: TodoCreate, user=Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        db_todo = await db.scalar(
+            insert(Todos)
+            .values(title=todo.title, description=todo.description,
+                    completed=todo.completed, user_id=user.get("user_id"))
+            .returning(Todos)
+        )
+        await db.commit()
+        return {
+            "data": db_todo,
+            "message": "Todo created successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.get("/")
+async def get_todos(limit: int = Query(50, ge=1, le=500), after: Optional[int] = None,
+                    user=Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        query = select(Todos).where(Todos.user_id == user.get("user_id"))
+        if after is not None:
+            query = query.where(Todos.id > after)
+        todos = (await db.scalars(query.order_by(Todos.id).limit(limit))).all()
+        return {
+            "data": todos,
+            "next": todos[-1].id if len(todos) == limit else None,
+            "message": "Todos fetched successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.post("/bulk/create")
+async def bulk_create_todos(todos: TodoBulkCreate, user=Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        user_id = user.get("user_id")
+        rows = [{"title": todo.title, "description": todo.description,
+                 "completed": todo.completed, "user_id": user_id} for todo in todos.todos]
+        created = (await db.scalars(insert(Todos).values(rows).returning(Todos))).all()
+        await db.commit()
+        return {
+            "data": created,
+            "message": f"{len(created)} todos created successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.put("/bulk/update")
+async def bulk_update_todos(todo_update: TodoBulkUpdate, user=Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        values = todo_update.model_dump(exclude={"ids"}, exclude_none=True)
+        if not values:
+            raise HTTPException(status_code=400, detail="Nothing to update")
+        updated = (await db.scalars(
+            update(Todos)
+            .where(Todos.id == ids_param(todo_update.ids), Todos.user_id == user.get("user_id"))
+            .values(**values)
+            .returning(Todos)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+        return {
+            "data": updated,
+            "message": f"{len(updated)} todos updated successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.delete("/bulk/delete")
+async def bulk_delete_todos(todo_ids: TodoBulkIds, user=Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted = (await db.scalars(
+            delete(Todos)
+            .where(Todos.id == ids_param(todo_ids.ids), Todos.user_id == user.get("user_id"))
+            .returning(Todos.id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await db.commit()
+        return {
+            "data": deleted,
+            "message": f"{len(deleted)} todos deleted",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.get("/{todo_id}")
+async def get_todo(todo_id: int, user = Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        todo = await db.scalar(
+            select(Todos).where(Todos.id == todo_id, Todos.user_id == user.get("user_id"))
+        )
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        return {
+            "data": todo,
+            "message": "Todo fetched successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.put("/{todo_id}")
+async def update_todo(todo_id: int, todo_update: TodoCreate, user = Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        todo = await db.scalar(
+            update(Todos)
+            .where(Todos.id == todo_id, Todos.user_id == user.get("user_id"))
+            .values(title=todo_update.title, description=todo_update.description,
+                    completed=todo_update.completed)
+            .returning(Todos)
+            .execution_options(synchronize_session=False)
+        )
+        if not todo:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        await db.commit()
+        return {
+            "data": todo,
+            "message": "Todo updated successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.delete("/{todo_id}")
+async def delete_todo(todo_id: int, user = Depends(verify_token), db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted_id = await db.scalar(
+            delete(Todos)
+            .where(Todos.id == todo_id, Todos.user_id == user.get("user_id"))
+            .returning(Todos.id)
+            .execution_options(synchronize_session=False)
+        )
+        if deleted_id is None:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        await db.commit()
+        return {
+            "message": "Todo deleted",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends,HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_async_db
+from models.todo_model import Users
+from utils.auth_utils import create_access_token, hash_password, verify_api_key, verify_password
+from validations.validation import LoginUser, UserCreate
+
+
+# Same endpoints as user_routes, but async
+user_router = APIRouter()
+
+
+@user_router.post("/register")
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        # bcrypt is slow on purpose, keep it off the event loop
+        user_hash_password = await run_in_threadpool(hash_password, user.password)
+        db_user = await db.scalar(
+            insert(Users)
+            .values(name=user.name, email=user.email, password=user_hash_password)
+            .returning(Users)
+        )
+        await db.commit()
+
+        token = create_access_token(data={"email": db_user.email, "name": db_user.name, "user_id": db_user.id})
+        return {
+            "data": {
+                "name": db_user.name,
+                "email": db_user.email,
+                "token": token
+                },
+            "message": "User registered and login successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@user_router.post("/login", dependencies=[Depends(verify_api_key)])
+async def login_user(user:LoginUser, db: AsyncSession = Depends(get_async_db)):
+    try:
+        db_user = await db.scalar(select(Users).where(Users.email == user.email))
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        is_valid_password = await run_in_threadpool(verify_password, user.password, db_user.password)
+        if is_valid_password == False:
+            raise HTTPException(status_code=401, detail="Invalid password")
+        token = create_access_token(data={"email": db_user.email, "name": db_user.name, "user_id": db_user.id})
+        user_data = {
+            "name": db_user.name,
+            "email": db_user.email,
+            "token": token
+        }
+
+        return {
+            "data": user_data,
+            "message": "User logged in successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
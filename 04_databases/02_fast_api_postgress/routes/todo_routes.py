@@ -1,10 +1,13 @@
+from typing import Optional
 from urllib import response
 from config.database import get_db
-from fastapi import APIRouter,Depends,HTTPException
+from fastapi import APIRouter,Depends,HTTPException,Query
 from models.todo_model import Todos
+from sqlalchemy import Integer, any_, bindparam, delete, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 from utils.auth_utils import verify_token
-from validations.validation import StandardReseponse, TodoCreate
+from validations.validation import StandardReseponse, TodoBulkCreate, TodoBulkIds, TodoBulkUpdate, TodoCreate
 
 todo_router = APIRouter()
 
@@ -33,12 +36,23 @@ def create_todo(todo: TodoCreate, user=Depends(verify_token), db: Session  = Dep
 
 
 
+def ids_param(ids):
+    # Sends the whole id list as one Postgres array: WHERE id = ANY(:ids)
+    return any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+
+
 @todo_router.get("/")
-def get_todos(user=Depends(verify_token),db: Session = Depends(get_db)):
+def get_todos(limit: int = Query(50, ge=1, le=500), after: Optional[int] = None,
+              user=Depends(verify_token), db: Session = Depends(get_db)):
     try:
-        todos = db.query(Todos).all()
+        # Keyset pagination: pass the "next" value of the previous page as ?after=
+        query = select(Todos).where(Todos.user_id == user.get("user_id"))
+        if after is not None:
+            query = query.where(Todos.id > after)
+        todos = db.scalars(query.order_by(Todos.id).limit(limit)).all()
         return {
             "data": todos,
+            "next": todos[-1].id if len(todos) == limit else None,
             "message": "Todos fetched successfully",
             "status": "success"
         }
@@ -51,13 +65,93 @@ def get_todos(user=Depends(verify_token),db: Session = Depends(get_db)):
             "data": None
         }
 
+# Bulk operations (one SQL statement each)
+
+
+@todo_router.post("/bulk/create")
+def bulk_create_todos(todos: TodoBulkCreate, user=Depends(verify_token), db: Session = Depends(get_db)):
+    try:
+        user_id = user.get("user_id")
+        rows = [{"title": todo.title, "description": todo.description,
+                 "completed": todo.completed, "user_id": user_id} for todo in todos.todos]
+        # INSERT ... VALUES (...), (...) RETURNING *
+        created = db.scalars(insert(Todos).values(rows).returning(Todos)).all()
+        db.commit()
+        return {
+            "data": created,
+            "message": f"{len(created)} todos created successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.put("/bulk/update")
+def bulk_update_todos(todo_update: TodoBulkUpdate, user=Depends(verify_token), db: Session = Depends(get_db)):
+    try:
+        values = todo_update.model_dump(exclude={"ids"}, exclude_none=True)
+        if not values:
+            raise HTTPException(status_code=400, detail="Nothing to update")
+        updated = db.scalars(
+            update(Todos)
+            .where(Todos.id == ids_param(todo_update.ids), Todos.user_id == user.get("user_id"))
+            .values(**values)
+            .returning(Todos)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return {
+            "data": updated,
+            "message": f"{len(updated)} todos updated successfully",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
+
+@todo_router.delete("/bulk/delete")
+def bulk_delete_todos(todo_ids: TodoBulkIds, user=Depends(verify_token), db: Session = Depends(get_db)):
+    try:
+        deleted = db.scalars(
+            delete(Todos)
+            .where(Todos.id == ids_param(todo_ids.ids), Todos.user_id == user.get("user_id"))
+            .returning(Todos.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return {
+            "data": deleted,
+            "message": f"{len(deleted)} todos deleted",
+            "status": "success"
+        }
+    except Exception as e:
+        print('An exception occurred')
+        print(e)
+        return {
+            "message": str(e),
+            "status": "error",
+            "data": None
+        }
+
 # Get a Todo by ID
 
 
 @todo_router.get("/{todo_id}")
 def get_todo(todo_id: int, user = Depends(verify_token), db: Session = Depends(get_db)):
     try:
-        todo = db.query(Todos).filter(Todos.id == todo_id).first()
+        todo = db.query(Todos).filter(Todos.id == todo_id, Todos.user_id == user.get("user_id")).first()
         if not todo:
             raise HTTPException(status_code=404, detail="Todo not found")
         return {
@@ -80,15 +174,18 @@ def get_todo(todo_id: int, user = Depends(verify_token), db: Session = Depends(g
 @todo_router.put("/{todo_id}")
 def update_todo(todo_id: int, todo_update: TodoCreate, user = Depends(verify_token), db: Session = Depends(get_db)):
     try: 
-        todo = db.query(Todos).filter(Todos.id == todo_id).first()
+        # UPDATE ... RETURNING in one round trip instead of SELECT + UPDATE
+        todo = db.scalars(
+            update(Todos)
+            .where(Todos.id == todo_id, Todos.user_id == user.get("user_id"))
+            .values(title=todo_update.title, description=todo_update.description,
+                    completed=todo_update.completed)
+            .returning(Todos)
+            .execution_options(synchronize_session=False)
+        ).first()
         if not todo:
             raise HTTPException(status_code=404, detail="Todo not found")
-
-        todo.title = todo_update.title
-        todo.description = todo_update.description
-        todo.completed = todo_update.completed
         db.commit()
-        db.refresh(todo)
         return {
             "data": todo,
             "message": "Todo updated successfully",
@@ -106,14 +203,17 @@ def update_todo(todo_id: int, todo_update: TodoCreate, user = Depends(verify_tok
 # Delete a Todo
 
 
-@todo_router.delete("/{todo_id}",dependencies=[Depends(verify_token)])
-def delete_todo(todo_id: int, db: Session = Depends(get_db)):
+@todo_router.delete("/{todo_id}")
+def delete_todo(todo_id: int, user = Depends(verify_token), db: Session = Depends(get_db)):
     try:
-        todo = db.query(Todos).filter(Todos.id == todo_id).first()
-        if not todo:
+        deleted_id = db.scalars(
+            delete(Todos)
+            .where(Todos.id == todo_id, Todos.user_id == user.get("user_id"))
+            .returning(Todos.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if deleted_id is None:
             raise HTTPException(status_code=404, detail="Todo not found")
-
-        db.delete(todo)
         db.commit()
         return {
             "message": "Todo deleted",
@@ -1,6 +1,7 @@
 import email
 from email import message
 from pydantic import BaseModel,Field,AfterValidator
+from typing import Optional
 from typing_extensions import Annotated
 
 
@@ -19,6 +20,21 @@ class TodoCreate(BaseModel):
     # token: str 
     
 
+class TodoBulkCreate(BaseModel):
+    todos: Annotated[list[TodoCreate], Field(min_length=1, max_length=1000)]
+
+
+class TodoBulkUpdate(BaseModel):
+    ids: Annotated[list[int], Field(min_length=1, max_length=1000)]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+
+
+class TodoBulkIds(BaseModel):
+    ids: Annotated[list[int], Field(min_length=1, max_length=1000)]
+    
+
 class LoginUser(BaseModel):
     email: str
     password: str
@@ -1,4 +1,5 @@
 import pandas as pd
+from chunk_engine import apply_brackets, bracket_labels, process_csv, RunningAggregate, TAX_LIMITS, TAX_KEEP
 data = {
     "Name": ["Alice", "Bob", "Charlie"],
     "Age": [25, 30, 35],
@@ -18,8 +19,25 @@ def calculate_tax(salary):
 df["Salary_After_Tax"] = df["Salary"].apply(calculate_tax)
 print(df)
 
+# Same result for the whole column at once (much faster on big data)
+df["Salary_After_Tax"] = apply_brackets(df["Salary"], TAX_LIMITS, TAX_KEEP)
+df["Tax_Bracket"] = bracket_labels(df["Salary"], TAX_LIMITS, ["low", "middle", "high"])
+print(df)
+
 
 chunk_size = 100
 for chunk in pd.read_csv("imdb-top-1000.csv", chunksize=chunk_size):
     print(chunk)
-    # Do something with the chunk
\ No newline at end of file
+    # Do something with the chunk
+
+# Read only the columns we need and keep running totals across chunks
+rating_by_year = RunningAggregate("IMDB_Rating", "Released_Year")
+rows = process_csv(
+    "imdb-top-1000.csv",
+    aggregates=[rating_by_year],
+    chunksize=chunk_size,
+    usecols=["Released_Year", "IMDB_Rating"],
+    dtype={"Released_Year": "string", "IMDB_Rating": "float32"},
+)
+print(f"{rows} movies")
+print(rating_by_year.result().sort_values("count", ascending=False).head())
@@ -0,0 +1,154 @@
+import argparse
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+
+# Usage:
+#   python 03_opencv_pipeline.py                          (webcam)
+#   python 03_opencv_pipeline.py --source video.mp4 --headless
+parser = argparse.ArgumentParser()
+parser.add_argument("--source", default="0", help="webcam index or video file")
+parser.add_argument("--scale", type=float, default=0.5, help="downscale factor for detection")
+parser.add_argument("--detect-every", type=int, default=5, help="run the detector every N frames")
+parser.add_argument("--headless", action="store_true", help="do not open a window")
+args = parser.parse_args()
+
+source = int(args.source) if args.source.isdigit() else args.source
+is_camera = isinstance(source, int)
+
+# Load the pre-trained Haar cascade classifier for face detection
+face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+frames = queue.Queue(maxsize=4)
+detect_requests = queue.Queue(maxsize=1)
+detect_results = queue.Queue()
+stop = threading.Event()
+
+# Total seconds and number of calls per stage
+timings = {"capture": [0.0, 0], "detect": [0.0, 0], "track": [0.0, 0], "render": [0.0, 0]}
+
+
+def record(stage, start):
+    timings[stage][0] += time.perf_counter() - start
+    timings[stage][1] += 1
+
+
+def capture_worker():
+    cap = cv2.VideoCapture(source)
+    while not stop.is_set():
+        start = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        record("capture", start)
+
+        if is_camera and frames.full():
+            # For a live camera drop the oldest frame instead of falling behind
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+        frames.put(frame)
+    cap.release()
+    frames.put(None)
+
+
+def detect_worker():
+    while True:
+        item = detect_requests.get()
+        if item is None:
+            break
+        frame_id, gray = item
+
+        start = time.perf_counter()
+        small = cv2.resize(gray, None, fx=args.scale, fy=args.scale)
+        min_size = max(1, int(30 * args.scale))
+        faces = face_cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=4, minSize=(min_size, min_size))
+        # Scale the boxes back to full resolution
+        boxes = [tuple(int(v / args.scale) for v in face) for face in faces]
+        record("detect", start)
+
+        detect_results.put((frame_id, boxes))
+
+
+def track_boxes(prev_gray, gray, boxes):
+    # Move every box by the median optical flow of the corners inside it
+    tracked = []
+    for (x, y, w, h) in boxes:
+        roi = prev_gray[y:y + h, x:x + w]
+        points = cv2.goodFeaturesToTrack(roi, maxCorners=20, qualityLevel=0.01, minDistance=5)
+        if points is None:
+            tracked.append((x, y, w, h))
+            continue
+        points = points + np.array([x, y], dtype=np.float32)
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None)
+        good = status.ravel() == 1
+        if not good.any():
+            tracked.append((x, y, w, h))
+            continue
+        dx, dy = np.median((new_points - points)[good].reshape(-1, 2), axis=0)
+        # Keep the box inside the frame
+        new_x = min(max(int(x + dx), 0), gray.shape[1] - w)
+        new_y = min(max(int(y + dy), 0), gray.shape[0] - h)
+        tracked.append((new_x, new_y, w, h))
+    return tracked
+
+
+capture_thread = threading.Thread(target=capture_worker, daemon=True)
+detect_thread = threading.Thread(target=detect_worker, daemon=True)
+capture_thread.start()
+detect_thread.start()
+
+boxes = []
+prev_gray = None
+frame_id = 0
+start_time = time.perf_counter()
+
+while True:
+    frame = frames.get()
+    if frame is None:
+        break
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    # Ask for a new detection every N frames (skip if the detector is still busy)
+    if frame_id % args.detect_every == 0 and detect_requests.empty():
+        detect_requests.put((frame_id, gray))
+
+    # Use the latest detection if there is one, otherwise track the old boxes
+    try:
+        while True:
+            _, boxes = detect_results.get_nowait()
+    except queue.Empty:
+        if prev_gray is not None and boxes:
+            start = time.perf_counter()
+            boxes = track_boxes(prev_gray, gray, boxes)
+            record("track", start)
+
+    start = time.perf_counter()
+    # Draw rectangles around detected faces
+    for (x, y, w, h) in boxes:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 3)  # Green rectangle
+
+    if not args.headless:
+        # Display the frame with detected faces
+        cv2.imshow("Live Face Detection", frame)
+        # Exit if 'q' is pressed
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    record("render", start)
+
+    prev_gray = gray
+    frame_id += 1
+
+elapsed = time.perf_counter() - start_time
+stop.set()
+detect_requests.put(None)
+detect_thread.join()
+cv2.destroyAllWindows()
+
+print(f"Processed {frame_id} frames in {elapsed:.2f}s ({frame_id / elapsed:.1f} FPS)")
+for stage, (total, count) in timings.items():
+    if count:
+        print(f"  {stage:8s} {total / count * 1000:7.2f} ms avg over {count} calls")
@@ -1,9 +1,14 @@
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
-nltk.download('vader_lexicon')
+
+# Download the lexicon only the first time
+try:
+    nltk.data.find('sentiment/vader_lexicon.zip')
+except LookupError:
+    nltk.download('vader_lexicon')
 
 sia = SentimentIntensityAnalyzer()
 text = "NLTK is bad for natural language processing!"
 sentiment = sia.polarity_scores(text)
 
-print(sentiment) 
\ No newline at end of file
+print(sentiment)
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import nltk
+import pandas as pd
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+# Folder where the VADER lexicon is stored. Download it once with:
+#   python sentiment_batch.py --download
+NLTK_DATA = os.getenv("NLTK_DATA", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+CHUNK_SIZE = 5000
+
+_analyzer = None
+
+
+def load_analyzer():
+    # Load the lexicon from the local folder only, never from the network
+    global _analyzer
+    if _analyzer is None:
+        if NLTK_DATA not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA)
+        try:
+            nltk.data.find("sentiment/vader_lexicon.zip")
+        except LookupError:
+            raise RuntimeError(
+                f"vader_lexicon not found in {NLTK_DATA}, run: python sentiment_batch.py --download"
+            )
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def score_chunk(texts):
+    sia = load_analyzer()
+    return [sia.polarity_scores(text if isinstance(text, str) else "") for text in texts]
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SentimentScorer:
+    """Scores many texts with VADER across a pool of worker processes."""
+
+    def __init__(self, workers=None, chunk_size=CHUNK_SIZE):
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.texts = 0
+        self.seconds = 0.0
+
+    def pool(self):
+        # Each worker loads the lexicon once, when it starts
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=load_analyzer)
+
+    def score(self, texts, pool=None):
+        """Yield one score dict per text, in the same order as the input.
+
+        Pass a pool from self.pool() to reuse the worker processes across calls."""
+        if pool is None:
+            with self.pool() as pool:
+                yield from self.score(texts, pool)
+            return
+
+        start = time.perf_counter()
+        # Keep only a few chunks in flight (pool.map would read the whole input first)
+        pending = deque()
+        for chunk in chunks(texts, self.chunk_size):
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= self.workers * 2:
+                results = pending.popleft().result()
+                self.texts += len(results)
+                yield from results
+        while pending:
+            results = pending.popleft().result()
+            self.texts += len(results)
+            yield from results
+        self.seconds += time.perf_counter() - start
+
+    def score_csv(self, path, column, output_path, csv_chunk_size=100_000):
+        """Read a CSV column in chunks and write it back with score columns added."""
+        first = True
+        # One pool for the whole file, not one per CSV chunk
+        with self.pool() as pool:
+            for frame in pd.read_csv(path, chunksize=csv_chunk_size):
+                scores = pd.DataFrame(list(self.score(frame[column], pool)), index=frame.index)
+                frame.join(scores).to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+                first = False
+
+    def metrics(self):
+        return {
+            "texts": self.texts,
+            "seconds": round(self.seconds, 3),
+            "texts_per_second": round(self.texts / self.seconds, 1) if self.seconds else 0,
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--download":
+        nltk.download("vader_lexicon", download_dir=NLTK_DATA)
+    elif len(sys.argv) == 4:
+        # python sentiment_batch.py reviews.csv review_text scored.csv
+        scorer = SentimentScorer()
+        scorer.score_csv(sys.argv[1], sys.argv[2], sys.argv[3])
+        print(scorer.metrics())
+    else:
+        scorer = SentimentScorer()
+        texts = ["NLTK is bad for natural language processing!", "I love this course"] * 50_000
+        scores = list(scorer.score(texts))
+        print(scores[:2])
+        print(scorer.metrics())
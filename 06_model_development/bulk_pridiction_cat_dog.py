@@ -1,37 +1,152 @@
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
+from model_loader import load_cat_dog_model, load_image
 import numpy as np
 import os
+import collections
+import json
+import queue
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Settings
+DATA_FOLDER = "data"
+MANIFEST_FILE = "manifest.jsonl"
+BATCH_SIZE = 64
+DECODE_WORKERS = os.cpu_count() or 4
+COPY_WORKERS = 4
+QUEUE_SIZE = BATCH_SIZE * 4
 
 # Load saved model
-model = load_model("cat_dog_model.h5")
+model = load_cat_dog_model(BATCH_SIZE)
 
 # Create output directories if they don't exist
 os.makedirs("cats", exist_ok=True)
 os.makedirs("dogs", exist_ok=True)
 
-# Folder containing images
-data_folder = "data"
-
-# Iterate over images in data folder
-for img_file in os.listdir(data_folder):
-    img_path = os.path.join(data_folder, img_file)
-
-    # Load and preprocess image
-    img = image.load_img(img_path, target_size=(150, 150))
-    img_tensor = image.img_to_array(img)
-    img_tensor = np.expand_dims(img_tensor, axis=0)
-    img_tensor /= 255.
-
-    # Predict
-    prediction = model.predict(img_tensor)
-    
-    # Move file based on prediction
-    if prediction[0][0] > 0.5:
-        shutil.copy(img_path, os.path.join("dogs", img_file))
-        print(f"{img_file}: Dog")
-    else:
-        shutil.copy(img_path, os.path.join("cats", img_file))
-        print(f"{img_file}: Cat")
\ No newline at end of file
+# Files that could not be decoded
+skipped = []
+
+
+def load_manifest(path):
+    # Files listed in the manifest were already classified in an earlier run
+    done = set()
+    if not os.path.exists(path):
+        return done
+    good_end = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                if line.strip():
+                    done.add(json.loads(line)["file"])
+            except (ValueError, KeyError):
+                break
+            good_end = f.tell()
+    if good_end < os.path.getsize(path):
+        # A killed run left half a line, cut it off so new lines are not glued to it
+        print(f"Ignoring an incomplete last line in {path}")
+        os.truncate(path, good_end)
+    return done
+
+
+def decode_stage(files, out_queue):
+    # Decode images in parallel, but never keep more than QUEUE_SIZE decodes
+    # pending, so together with the bounded queue memory stays flat no matter
+    # how many files are in the folder
+    pending = collections.deque()
+    try:
+        with ThreadPoolExecutor(max_workers=DECODE_WORKERS) as pool:
+            for img_file in files:
+                pending.append((img_file, pool.submit(load_image, os.path.join(DATA_FOLDER, img_file))))
+                if len(pending) >= QUEUE_SIZE:
+                    put_decoded(pending.popleft(), out_queue)
+            while pending:
+                put_decoded(pending.popleft(), out_queue)
+    finally:
+        # classify() stops only when it sees None, so always send it
+        out_queue.put(None)
+
+
+def put_decoded(item, out_queue):
+    img_file, future = item
+    try:
+        out_queue.put((img_file, future.result()))
+    except Exception as e:
+        # Not an image (e.g. .DS_Store) or a broken file, skip it
+        skipped.append(img_file)
+        print(f"Skipping {img_file}: {e}")
+
+
+def copy_file(img_file, label):
+    folder = "dogs" if label == "Dog" else "cats"
+    shutil.copy(os.path.join(DATA_FOLDER, img_file), os.path.join(folder, img_file))
+    return img_file, label
+
+
+def classify(files, manifest):
+    image_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    decoder = threading.Thread(target=decode_stage, args=(files, image_queue), daemon=True)
+    decoder.start()
+
+    copy_pool = ThreadPoolExecutor(max_workers=COPY_WORKERS)
+    pending = []
+    finished = False
+
+    while not finished:
+        # Fill one batch from the queue
+        names, tensors = [], []
+        while len(names) < BATCH_SIZE:
+            item = image_queue.get()
+            if item is None:
+                finished = True
+                break
+            names.append(item[0])
+            tensors.append(item[1])
+
+        if not names:
+            break
+
+        # Predict the whole batch at once
+        predictions = model.predict(np.stack(tensors), batch_size=BATCH_SIZE, verbose=0)
+
+        # Copy files in the background while the next batch is decoded
+        for img_file, prediction in zip(names, predictions):
+            label = "Dog" if prediction[0] > 0.5 else "Cat"
+            pending.append(copy_pool.submit(copy_file, img_file, label))
+
+        # Record finished copies so a re-run can skip them
+        still_pending = []
+        for future in pending:
+            if future.done():
+                img_file, label = future.result()
+                manifest.write(json.dumps({"file": img_file, "label": label}) + "\n")
+                print(f"{img_file}: {label}")
+            else:
+                still_pending.append(future)
+        pending = still_pending
+        manifest.flush()
+
+    for future in pending:
+        img_file, label = future.result()
+        manifest.write(json.dumps({"file": img_file, "label": label}) + "\n")
+        print(f"{img_file}: {label}")
+
+    copy_pool.shutdown()
+    decoder.join()
+
+
+done = load_manifest(MANIFEST_FILE)
+files = [f for f in sorted(os.listdir(DATA_FOLDER)) if f not in done]
+print(f"{len(done)} files already classified, {len(files)} to go")
+
+start = time.perf_counter()
+with open(MANIFEST_FILE, "a") as manifest:
+    classify(files, manifest)
+elapsed = time.perf_counter() - start
+
+if skipped:
+    print(f"Skipped {len(skipped)} files that are not images: {', '.join(skipped)}")
+if files:
+    print(f"Classified {len(files) - len(skipped)} images in {elapsed:.1f}s ({(len(files) - len(skipped)) / elapsed:.1f} images/s)")
@@ -1,28 +1,133 @@
+import hashlib
+import json
+import os
+import numpy as np
+import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import Conv2D, MaxPooling2D, Flatten, Dense, Dropout
+from tensorflow.keras.preprocessing import image
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from model_loader import IMAGE_EXTENSIONS
 
 # Constants
 IMG_SIZE = (150, 150)
 BATCH_SIZE = 32
+TRAIN_DIR = '../../dataset/train'
+VAL_DIR = '../../dataset/validation'
 
-# Data generators
-train_datagen = ImageDataGenerator(rescale=1.0/255)
-val_datagen = ImageDataGenerator(rescale=1.0/255)
+# Set USE_CACHE=1 to decode the JPEGs once into a memory-mapped store
+# instead of decoding every image again in every epoch
+USE_CACHE = os.getenv("USE_CACHE", "0") == "1"
+CACHE_DIR = os.getenv("CACHE_DIR", "tensor_cache")
 
-train_data = train_datagen.flow_from_directory(
-    '../../dataset/train',
-    target_size=IMG_SIZE,
-    batch_size=BATCH_SIZE,
-    class_mode='binary'
-)
 
-val_data = val_datagen.flow_from_directory(
-    '../../dataset/validation',
-    target_size=IMG_SIZE,
-    batch_size=BATCH_SIZE,
-    class_mode='binary'
-)
+def list_images(directory):
+    # Same class order as flow_from_directory (sorted sub folder names)
+    classes = sorted(
+        d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d))
+    )
+    files, labels = [], []
+    for label, class_name in enumerate(classes):
+        class_dir = os.path.join(directory, class_name)
+        for img_file in sorted(os.listdir(class_dir)):
+            # Skip .DS_Store and other non-images, like flow_from_directory does
+            if not img_file.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            files.append(os.path.join(class_dir, img_file))
+            labels.append(label)
+    return classes, files, labels
+
+
+def content_hash(files):
+    # Any added, removed or changed file (or a new image size) gives a new hash
+    h = hashlib.sha256(str(IMG_SIZE).encode())
+    for path in files:
+        stat = os.stat(path)
+        h.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def build_tensor_store(directory, name):
+    classes, files, labels = list_images(directory)
+    if not files:
+        # np.memmap cannot create an empty file
+        raise ValueError(f"No images found in the class folders of {directory}")
+    digest = content_hash(files)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    data_path = os.path.join(CACHE_DIR, f"{name}.u8")
+    index_path = os.path.join(CACHE_DIR, f"{name}.json")
+    shape = (len(files), IMG_SIZE[0], IMG_SIZE[1], 3)
+
+    # Reuse the store if it was built from the same files
+    if os.path.exists(index_path) and os.path.exists(data_path):
+        with open(index_path) as f:
+            index = json.load(f)
+        if index["hash"] == digest:
+            print(f"Using cached {name} tensors ({len(files)} images)")
+            images = np.memmap(data_path, dtype=np.uint8, mode="r", shape=shape)
+            return images, np.array(index["labels"], dtype=np.float32)
+
+    print(f"Building {name} tensor store ({len(files)} images)...")
+    images = np.memmap(data_path, dtype=np.uint8, mode="w+", shape=shape)
+    for i, path in enumerate(files):
+        img = image.load_img(path, target_size=IMG_SIZE)
+        images[i] = image.img_to_array(img, dtype=np.uint8)
+    images.flush()
+
+    with open(index_path, "w") as f:
+        json.dump({"hash": digest, "classes": classes, "labels": labels}, f)
+
+    images = np.memmap(data_path, dtype=np.uint8, mode="r", shape=shape)
+    return images, np.array(labels, dtype=np.float32)
+
+
+def cached_dataset(images, labels, shuffle):
+    # Read uint8 images from the memory map and rescale them on the fly
+    def generator():
+        order = np.random.permutation(len(labels)) if shuffle else np.arange(len(labels))
+        for i in order:
+            yield images[i], labels[i]
+
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(IMG_SIZE[0], IMG_SIZE[1], 3), dtype=tf.uint8),
+            tf.TensorSpec(shape=(), dtype=tf.float32),
+        ),
+    )
+    dataset = dataset.batch(BATCH_SIZE)
+    dataset = dataset.map(
+        lambda x, y: (tf.cast(x, tf.float32) / 255.0, y),
+        num_parallel_calls=tf.data.AUTOTUNE,
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+if USE_CACHE:
+    train_images, train_labels = build_tensor_store(TRAIN_DIR, "train")
+    val_images, val_labels = build_tensor_store(VAL_DIR, "validation")
+
+    train_data = cached_dataset(train_images, train_labels, shuffle=True)
+    val_data = cached_dataset(val_images, val_labels, shuffle=False)
+else:
+    # Data generators
+    train_datagen = ImageDataGenerator(rescale=1.0/255)
+    val_datagen = ImageDataGenerator(rescale=1.0/255)
+
+    train_data = train_datagen.flow_from_directory(
+        TRAIN_DIR,
+        target_size=IMG_SIZE,
+        batch_size=BATCH_SIZE,
+        class_mode='binary'
+    )
+
+    val_data = val_datagen.flow_from_directory(
+        VAL_DIR,
+        target_size=IMG_SIZE,
+        batch_size=BATCH_SIZE,
+        class_mode='binary'
+    )
 
 print("Training data shape:", train_data)
 
@@ -49,4 +154,4 @@ model.fit(train_data, epochs=2, validation_data=val_data)
 
 # Save model
 model.save("cat_dog_model.h5")
-print("Model saved to cat_dog_model.h5")
\ No newline at end of file
+print("Model saved to cat_dog_model.h5")
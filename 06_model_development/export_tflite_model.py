@@ -0,0 +1,43 @@
+import os
+import sys
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+from model_loader import IMAGE_EXTENSIONS, load_image
+
+# Usage: python export_tflite_model.py [float16|dynamic|int8]
+#   float16 - weights stored as float16 (half size, almost no accuracy loss)
+#   dynamic - int8 weights, float activations
+#   int8    - int8 weights and activations, calibrated on images from data/
+MODE = sys.argv[1] if len(sys.argv) > 1 else "float16"
+CALIBRATION_FOLDER = "data"
+OUTPUT_FILE = "cat_dog_model.tflite"
+
+model = load_model("cat_dog_model.h5")
+converter = tf.lite.TFLiteConverter.from_keras_model(model)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+if MODE == "float16":
+    converter.target_spec.supported_types = [tf.float16]
+elif MODE == "int8":
+    def representative_dataset():
+        # A few hundred real images are enough to calibrate activation ranges
+        files = [f for f in sorted(os.listdir(CALIBRATION_FOLDER)) if f.lower().endswith(IMAGE_EXTENSIONS)]
+        if not files:
+            raise SystemExit(f"No images in {CALIBRATION_FOLDER} to calibrate the int8 model with")
+        for img_file in files[:200]:
+            img_tensor = load_image(os.path.join(CALIBRATION_FOLDER, img_file))
+            yield [np.expand_dims(img_tensor, axis=0)]
+
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+elif MODE != "dynamic":
+    raise SystemExit(f"Unknown mode: {MODE}")
+
+tflite_model = converter.convert()
+with open(OUTPUT_FILE, "wb") as f:
+    f.write(tflite_model)
+
+h5_size = os.path.getsize("cat_dog_model.h5") / 1e6
+tflite_size = len(tflite_model) / 1e6
+print(f"Saved {OUTPUT_FILE} ({MODE}): {tflite_size:.1f} MB (h5 was {h5_size:.1f} MB)")
@@ -1,30 +1,132 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, File, UploadFile
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
+from model_loader import load_cat_dog_model, load_image
 import numpy as np
 from io import BytesIO
-from PIL import Image
 
 app = FastAPI()
 
+# Batching settings (can be changed with environment variables)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.getenv("MAX_WAIT_MS", "10"))
+
 # Load saved model
-model = load_model("cat_dog_model.h5")
+model = load_cat_dog_model(MAX_BATCH_SIZE)
+
+# One worker thread runs model.predict so the event loop is never blocked
+executor = ThreadPoolExecutor(max_workers=1)
+
+
+class BatchPredictor:
+    """Collects concurrent requests and runs them through the model as one batch."""
+
+    def __init__(self, model, max_batch_size=32, max_wait_ms=10):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.worker = None
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        self.worker = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.worker:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, img_tensor):
+        # Every request gets a future that is resolved when its batch finishes
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((img_tensor, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for the first request, then collect more until the batch is
+            # full or the time window is over
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            tensors = np.stack([item[0] for item in batch])
+            try:
+                predictions = await loop.run_in_executor(
+                    executor, lambda: self.model.predict(tensors, verbose=0)
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+
+            # Send each result back to the request that is waiting for it
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+
+
+batcher = BatchPredictor(model, MAX_BATCH_SIZE, MAX_WAIT_MS)
+
+
+@app.on_event("startup")
+async def start_batcher():
+    batcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+    executor.shutdown(wait=False)
+
 
 @app.post("/predict")
 async def predict(file: UploadFile = File(...)):
     # Read image file
     contents = await file.read()
-    img = Image.open(BytesIO(contents)).resize((150, 150))
 
-    # Convert to numpy array and preprocess
-    img_tensor = image.img_to_array(img)
-    img_tensor = np.expand_dims(img_tensor, axis=0)
-    img_tensor /= 255.
+    # Convert to a preprocessed numpy array
+    img_tensor = load_image(BytesIO(contents))
+
+    # Make prediction (batched with other requests)
+    start = time.perf_counter()
+    prediction = await batcher.predict(img_tensor)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    result = "Dog" if prediction[0] > 0.5 else "Cat"
 
-    # Make prediction
-    prediction = model.predict(img_tensor)
-    print(prediction)
+    return {
+        "filename": file.filename,
+        "prediction": result,
+        "latency_ms": round(latency_ms, 2),
+    }
 
-    result = "Dog" if prediction[0][0] > 0.5 else "Cat"
 
-    return {"filename": file.filename, "prediction": result}
+@app.get("/stats")
+async def stats():
+    average = batcher.items / batcher.batches if batcher.batches else 0
+    return {
+        "batches": batcher.batches,
+        "images": batcher.items,
+        "average_batch_size": round(average, 2),
+        "queue_size": batcher.queue.qsize(),
+    }
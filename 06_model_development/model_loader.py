@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+import numpy as np
+from PIL import Image
+
+TFLITE_FILE = "cat_dog_model.tflite"
+KERAS_FILE = "cat_dog_model.h5"
+INPUT_SHAPE = (150, 150, 3)
+# The extensions flow_from_directory accepts
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".ppm", ".tif", ".tiff")
+
+
+def load_image(source):
+    """Read an image (path or file object) as a float32 array scaled to 0-1.
+
+    Same result as keras load_img + img_to_array / 255 (nearest resize), but
+    with PIL only, so TensorFlow is not imported when the TFLite model is used."""
+    img = Image.open(source).convert("RGB").resize(INPUT_SHAPE[1::-1], Image.NEAREST)
+    return np.asarray(img, dtype=np.float32) / 255.
+
+
+class TFLiteModel:
+    """Wraps a TFLite interpreter with the same predict() call as a Keras model."""
+
+    def __init__(self, path):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite.python.interpreter import Interpreter
+
+        self.interpreter = Interpreter(model_path=path, num_threads=os.cpu_count())
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = 1
+        # The interpreter is not thread safe
+        self.lock = threading.Lock()
+
+    def predict(self, x, batch_size=None, verbose=0):
+        x = np.asarray(x, dtype=np.float32)
+        count = len(x)
+        with self.lock:
+            # Resizing reallocates every tensor, so only grow the input; smaller
+            # batches (the API batcher sends 1 to MAX_BATCH_SIZE images) are
+            # padded with zeros up to the allocated size
+            if count > self.batch_size:
+                self.interpreter.resize_tensor_input(self.input["index"], [count, *INPUT_SHAPE])
+                self.interpreter.allocate_tensors()
+                self.batch_size = count
+            elif count < self.batch_size:
+                padding = np.zeros((self.batch_size - count, *INPUT_SHAPE), dtype=np.float32)
+                x = np.concatenate([x, padding])
+
+            # Fully int8 models need their input quantized
+            if self.input["dtype"] != np.float32:
+                scale, zero_point = self.input["quantization"]
+                x = (x / scale + zero_point).astype(self.input["dtype"])
+
+            self.interpreter.set_tensor(self.input["index"], x)
+            self.interpreter.invoke()
+            output = self.interpreter.get_tensor(self.output["index"])[:count]
+
+        if self.output["dtype"] != np.float32:
+            scale, zero_point = self.output["quantization"]
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+def load_cat_dog_model(warmup_batch_size=1):
+    """Load the TFLite model if it was exported, otherwise the Keras .h5 model,
+    and run one dummy batch so the first real request is not slow."""
+    start = time.perf_counter()
+    if os.path.exists(TFLITE_FILE):
+        source = TFLITE_FILE
+        model = TFLiteModel(TFLITE_FILE)
+    else:
+        from tensorflow.keras.models import load_model
+
+        source = KERAS_FILE
+        model = load_model(KERAS_FILE)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.predict(np.zeros((warmup_batch_size, *INPUT_SHAPE), dtype=np.float32), verbose=0)
+    warmup_time = time.perf_counter() - start
+
+    print(f"Loaded {source} in {load_time * 1000:.0f} ms, first inference took {warmup_time * 1000:.0f} ms")
+    return model
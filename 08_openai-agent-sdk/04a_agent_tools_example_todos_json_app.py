@@ -4,6 +4,7 @@ from openai import AsyncOpenAI
 from agents import Agent, OpenAIChatCompletionsModel, Runner,function_tool
 import os
 from dotenv import load_dotenv
+from todo_log_store import TodoLogStore
 
 
 load_dotenv()
@@ -16,17 +17,22 @@ client = AsyncOpenAI(
 )
 
 
+# Append-only log of todos, started from todos.json the first time
+store = TodoLogStore(
+    "08_openai-agent-sdk/todos.jsonl",
+    legacy_json_path="08_openai-agent-sdk/todos.json",
+)
+
+
 @function_tool
 def list_todos():
-    """List all todos from the todos.json file."""
+    """List all todos."""
     try:
         print("Listing todos...")
-        with open("08_openai-agent-sdk/todos.json", "r") as file:
-            data = json.load(file)  # Use json.load to read directly from file
-        return data
+        return store.list()
     except Exception as e:
         print(f"Error: {e}")
-        raise FileNotFoundError("The file todos.json was not found.")
+        raise Exception(f"Failed to list todos: {str(e)}")
     
 import json
 from typing import Dict, Any
@@ -34,7 +40,7 @@ from datetime import datetime
 
 @function_tool
 def add_todo(title: str, description: str = "", due_date: str = "") -> Dict[str, Any]:
-    """Add a new todo to the todos.json file.
+    """Add a new todo.
     
     Args:
         title: The title of the todo.
@@ -45,39 +51,35 @@ def add_todo(title: str, description: str = "", due_date: str = "") -> Dict[str,
         The newly created todo item title.
     """
     try:
-        # Read existing todos
-        try:
-            with open("08_openai-agent-sdk/todos.json", "r") as file:
-                todos = json.load(file)
-        except FileNotFoundError:
-            todos = []  # If file doesn't exist, start with an empty list
-        except json.JSONDecodeError:
-            raise ValueError("Error decoding todos.json. Ensure it contains valid JSON.")
-
-        # Create new todo
-        new_todo = {
-            "id": len(todos) + 1,  # Simple incremental ID
+        # The store picks the next free id
+        return store.add({
             "title": title,
             "description": description,
             "completed": False,  # Default to not completed
             "dueDate": due_date if due_date else datetime.now().strftime("%Y-%m-%d")
-        }
-
-        # Append and save
-        todos.append(new_todo)
-        with open("08_openai-agent-sdk/todos.json", "w") as file:
-            json.dump(todos, file, indent=2)
-
-        return new_todo
+        })
 
     except Exception as e:
         raise Exception(f"Failed to add todo: {str(e)}")
 
+
+@function_tool
+def complete_todo(todo_id: int) -> Dict[str, Any]:
+    """Mark a todo as completed.
+
+    Args:
+        todo_id: The id of the todo.
+    """
+    todo = store.update(todo_id, completed=True)
+    if todo is None:
+        raise Exception(f"Todo {todo_id} not found")
+    return todo
+
 agent = Agent(
     name="Todos Assistant",
     instructions="You are an expert of todos. You can add, list, and complete todos.",
     model=OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
-    tools=[list_todos, add_todo],
+    tools=[list_todos, add_todo, complete_todo],
 )
 
 query = input("Enter the query: ")
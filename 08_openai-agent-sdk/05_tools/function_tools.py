@@ -1,9 +1,14 @@
 from openai import AsyncOpenAI
 from agents import Agent, OpenAIChatCompletionsModel, Runner, function_tool
 import os
+import sys
 from dotenv import load_dotenv
 load_dotenv()
 
+# tool_executor.py lives one folder up
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tool_executor import threaded_tool, print_tool_stats
+
 gemini_api_key = os.getenv('GEMINI_API_KEY')
 
 client = AsyncOpenAI(
@@ -23,7 +28,9 @@ async def fetch_weather(location) -> str:
     return "sunny"
 
 
-@function_tool  
+# Sync tools run in a thread pool, so the news and stock price calls of one
+# turn run at the same time instead of one after the other
+@threaded_tool(timeout=10)
 def fetch_news(location) -> str:
     """Fetch the news for a given location.
 
@@ -34,7 +41,7 @@ def fetch_news(location) -> str:
     # In real life, we'd fetch the news from a news API
     return "breaking news"
 
-@function_tool
+@threaded_tool(timeout=10)
 def fetch_stock_price(location) -> str:
     """Fetch the stock price for a given location.
 
@@ -62,4 +69,6 @@ result = Runner.run_sync(
     query,
 )
 
-print(result.final_output)
\ No newline at end of file
+print(result.final_output)
+
+print_tool_stats()
@@ -4,11 +4,17 @@ from agents import Agent, OpenAIChatCompletionsModel, Runner, function_tool
 import os
 from dotenv import load_dotenv
 from pinecone import Pinecone
+from chunker import CHUNKER_VERSION, chunk_records
+from ingestion import IngestionPipeline, PineconeStore
+from local_index import LocalVectorIndex
 
 load_dotenv()
 
 gemini_api_key = os.getenv('GEMINI_API_KEY')
 pinecone_api_key = os.getenv('PINECONE_API_KEY')
+# "pinecone" (default) or "local" for the in-process index in ./local_index
+vector_backend = os.getenv('VECTOR_BACKEND', 'pinecone')
+local_index = LocalVectorIndex("local_index") if vector_backend == "local" else None
 
 client = AsyncOpenAI(
     api_key=gemini_api_key,
@@ -30,50 +36,36 @@ def setup_db(pinecone_instance, index_name="testing"):
         )
     else:
         print(f"Index {index_name} already exists.")
+
+    # Poll until the index can take writes instead of sleeping a fixed time
+    delay = 0.5
+    while not pinecone_instance.describe_index(index_name).status["ready"]:
+        time.sleep(delay)
+        delay = min(delay * 2, 5)
     return "Index created successfully"
 
-def split_into_word_chunks(text, chunk_size=100):
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), chunk_size):
-        chunk = " ".join(words[i:i + chunk_size])
-        chunks.append(chunk)
-    return chunks
-    
 def insert_chunks_into_pinecone(index):
-    data_dir = "data"
-    record_counter = 1
-
-    for file_name in os.listdir(data_dir):
-        if file_name.endswith(".txt"):
-            namespace = os.path.splitext(file_name)[0]  # namespace = file name without extension
-            file_path = os.path.join(data_dir, file_name)
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read().replace("\n", " ").strip()  # Flatten text
-
-            chunks = split_into_word_chunks(text, chunk_size=100)
-
-            records = []
-            for chunk in chunks:
-                record = {
-                    "_id": f"rec{record_counter}",
-                    "chunk_text": chunk,
-                    "category": namespace
-                }
-                records.append(record)
-                record_counter += 1
-
-            # Upsert to Pinecone using namespace
-            index.upsert_records(namespace, records)
-            print(f"Upserted {len(records)} records to namespace '{namespace}'")
-            time.sleep(10)
-            stats = index.describe_index_stats()
-            print(stats)
+    # Only changed files are re-chunked and upserted, in parallel batches
+    store = index if isinstance(index, LocalVectorIndex) else PineconeStore(index)
+    pipeline = IngestionPipeline(
+        store,
+        chunker=chunk_records,
+        chunker_version=CHUNKER_VERSION,
+        data_dir="data",
+        manifest_path=f".ingest_manifest_{vector_backend}.json",
+    )
+    expected = pipeline.run()
+
+    print("Waiting for vectors to be indexed...")
+    stats = pipeline.wait_until_ready(expected)
+    print(stats)
 
     return "Inserted Successfully"
 
 def query_pinecone(query, namespace):
+    if local_index is not None:
+        return local_index.search(namespace, query, top_k=5)
+
     print(f"Querying Pinecone with query: {query}, namespace: {namespace}")
     pc = Pinecone(api_key=pinecone_api_key)
     index = pc.Index("testing")
@@ -287,31 +279,16 @@ def get_account_tech_info(query: str) -> str:
 
 
 if __name__ == "__main__":
-    pc = Pinecone(api_key=pinecone_api_key)
-    
+    if local_index is not None:
+        insert_chunks_into_pinecone(local_index)
+    else:
+        pc = Pinecone(api_key=pinecone_api_key)
 
-    setup_db(pc, index_name="testing")
+        setup_db(pc, index_name="testing")
 
-    index = pc.Index("testing")
-    
-    print("Waiting for index to be ready...")
-    for _ in range(12):
-        stats = index.describe_index_stats()
-        print(stats)
-        if stats.get("total_vector_count", 0) >= 50:
-            break
-        time.sleep(5)
-
-    insert_chunks_into_pinecone(index)
-
-    # 4. Wait for vectors to be fully indexed
-    print("Ensuring vectors are indexed...")
-    for _ in range(10):
-        stats = index.describe_index_stats()
-        print(stats)
-        if stats["total_vector_count"] >= 50:
-            break
-        time.sleep(5)
+        index = pc.Index("testing")
+
+        insert_chunks_into_pinecone(index)
 
     agent = Agent(
         name="Assistant",
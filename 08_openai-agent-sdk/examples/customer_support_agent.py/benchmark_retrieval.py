@@ -0,0 +1,83 @@
+import os
+import statistics
+import sys
+import time
+from dotenv import load_dotenv
+from chunker import CHUNKER_VERSION, chunk_records
+from ingestion import IngestionPipeline
+from local_index import LocalVectorIndex
+
+# Compares the local index with Pinecone: latency of both, and recall@k of
+# the local results measured against the Pinecone results.
+# Usage: python benchmark_retrieval.py [local_only]
+
+load_dotenv()
+
+QUERIES = {
+    "order_and_shipping_info": ["How long does standard shipping take?", "My package shows delivered but I did not get it"],
+    "product_info": ["Is the bamboo cutting board dishwasher safe?", "What certifications do your products have?"],
+    "return_refund_and_excahnges_info": ["How do I return an item?", "When will I get my refund?"],
+    "account_and_technical_info": ["How do I reset my password?", "My payment failed at checkout"],
+}
+TOP_K = 5
+
+
+def hit_ids(results):
+    return [hit["_id"] for hit in results["result"]["hits"]]
+
+
+def timed(func, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, times
+
+
+def report(name, times):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{name:10s} median {statistics.median(times):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+# Own folder and manifest so the benchmark never touches the agent's local
+# index, same chunker as agent.py so the ids match the Pinecone records
+local = LocalVectorIndex("benchmark_index")
+expected = IngestionPipeline(
+    local,
+    chunker=chunk_records,
+    chunker_version=CHUNKER_VERSION,
+    manifest_path=".ingest_manifest_benchmark.json",
+).run()
+local.namespace_counts()
+
+local_times, local_results = [], {}
+for namespace, queries in QUERIES.items():
+    for query in queries:
+        result, times = timed(lambda: local.search(namespace, query, TOP_K))
+        local_results[(namespace, query)] = hit_ids(result)
+        local_times += times
+report("local", local_times)
+
+if len(sys.argv) > 1 and sys.argv[1] == "local_only" or not os.getenv("PINECONE_API_KEY"):
+    sys.exit(0)
+
+from pinecone import Pinecone
+
+# Note: the remote ids come from the same ingestion pipeline, so they match
+index = Pinecone(api_key=os.getenv("PINECONE_API_KEY")).Index("testing")
+remote_times, recalls = [], []
+for namespace, queries in QUERIES.items():
+    for query in queries:
+        result, times = timed(
+            lambda: index.search(namespace=namespace, query={"top_k": TOP_K, "inputs": {"text": query}}),
+            repeat=5,
+        )
+        remote_ids = hit_ids(result)
+        remote_times += times
+        if remote_ids:
+            recalls.append(len(set(remote_ids) & set(local_results[(namespace, query)])) / len(remote_ids))
+report("pinecone", remote_times)
+if recalls:
+    print(f"recall@{TOP_K} of local vs pinecone: {statistics.mean(recalls):.2f}")
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import time
+from ingestion import IngestionPipeline, InMemoryVectorStore
+
+# Runs the ingestion pipeline against the in-memory fake store, which fails
+# every few upserts and makes writes visible only after a delay, like Pinecone.
+# Checks retries, skipping unchanged files, waiting for overwritten records,
+# removing stale records and clearing records with old ids.
+# Usage: python check_ingestion.py
+
+
+def split_paragraphs(path):
+    with open(path) as f:
+        return [p.strip() for p in f.read().split("\n\n") if p.strip()]
+
+
+def write(data_dir, name, paragraphs):
+    with open(os.path.join(data_dir, name), "w") as f:
+        f.write("\n\n".join(paragraphs))
+
+
+def ingest(store, data_dir):
+    pipeline = IngestionPipeline(
+        store,
+        chunker=split_paragraphs,
+        data_dir=data_dir,
+        manifest_path=os.path.join(data_dir, "manifest.json"),
+    )
+    expected = pipeline.run()
+    return expected, pipeline.wait_until_ready(expected, timeout=30)
+
+
+def texts(store, namespace, count):
+    fetched = store.fetch(namespace, [f"{namespace}-{i}" for i in range(count)])
+    return [fetched[f"{namespace}-{i}"]["chunk_text"] for i in range(count)]
+
+
+def main():
+    data_dir = tempfile.mkdtemp(prefix="ingest_check_")
+    try:
+        store = InMemoryVectorStore(fail_every=3, lag=0.3)
+
+        # Records with the ids the old ingestion code used
+        store.upsert_records("faq", [{"_id": f"rec{i}", "chunk_text": "old"} for i in range(1, 6)])
+        time.sleep(store.lag)
+
+        write(data_dir, "faq.txt", [f"question {i}" for i in range(10)])
+        write(data_dir, "shipping.txt", [f"shipping {i}" for i in range(4)])
+        expected, counts = ingest(store, data_dir)
+        assert counts == {"faq": 10, "shipping": 4}, counts
+        print("first run:", counts)
+
+        expected, counts = ingest(store, data_dir)
+        assert expected == {}, expected
+        print("unchanged files skipped")
+
+        # Same number of chunks: only the ingest_hash shows the new version
+        write(data_dir, "faq.txt", [f"answer {i}" for i in range(10)])
+        expected, counts = ingest(store, data_dir)
+        assert texts(store, "faq", 10) == [f"answer {i}" for i in range(10)]
+        print("overwritten records visible:", counts)
+
+        write(data_dir, "shipping.txt", ["shipping 0"])
+        expected, counts = ingest(store, data_dir)
+        assert counts == {"faq": 10, "shipping": 1}, counts
+        print("stale records removed:", counts)
+        print("OK")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
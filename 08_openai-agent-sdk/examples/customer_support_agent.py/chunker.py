@@ -0,0 +1,170 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text):
+        return len(_encoding.encode(text))
+except Exception:
+    # ImportError, or get_encoding failing to download the encoding (offline)
+    _token_re = re.compile(r"\w+|[^\w\s]")
+
+    def count_tokens(text):
+        # Rough count when tiktoken is not available
+        return len(_token_re.findall(text))
+
+
+# Stored in the ingest manifest: change it when chunk_records changes so
+# every file is chunked again
+CHUNKER_VERSION = "sections-200-40"
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*\S)")
+BOLD_HEADING_RE = re.compile(r"^\*\*(.+?)\*\*:?\s*$")
+QUESTION_RE = re.compile(r"^[*-]\s+\*\*(.+?)\*\*\s*$")
+SENTENCE_RE = re.compile(r"\S.*?(?:[.!?](?=\s|$)|$)", re.S)
+
+
+@dataclass
+class Unit:
+    text: str
+    start: int
+    end: int
+    section: List[str]
+    new_section: bool = False
+    tokens: int = 0
+
+
+@dataclass
+class Chunk:
+    text: str
+    start: int
+    end: int
+    section: List[str] = field(default_factory=list)
+    tokens: int = 0
+
+
+def iter_blocks(path):
+    """Read a text file line by line and yield (text, start, end, section, new_section)
+    for every paragraph. Markdown headings, bold lines and bold bullet questions
+    update the section path; offsets are character positions in the file."""
+    section = []
+    lines, start, offset = [], 0, 0
+    new_section = False
+
+    def flush():
+        text = "".join(lines)
+        if text.strip():
+            return text, start, start + len(text), list(section), new_section
+        return None
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for line in f:
+            stripped = line.strip()
+            heading = HEADING_RE.match(stripped)
+            bold = BOLD_HEADING_RE.match(stripped)
+            question = QUESTION_RE.match(stripped)
+
+            if not stripped or stripped == "---" or heading or bold or question:
+                block = flush()
+                if block:
+                    yield block
+                    new_section = False
+                lines, start = [], offset
+
+            if heading:
+                level = len(heading.group(1))
+                section = section[: level - 1] + [heading.group(2)]
+                new_section = True
+            elif bold:
+                # Bold lines are sub-headings under the last markdown heading
+                section = section[:1] + [bold.group(1).rstrip(":")]
+                new_section = True
+            elif question:
+                section = section[:2] + [question.group(1)]
+                new_section = True
+
+            if stripped and stripped != "---":
+                if not lines:
+                    start = offset
+                lines.append(line)
+            offset += len(line)
+
+    block = flush()
+    if block:
+        yield block
+
+
+def iter_units(path, max_tokens):
+    """Split every paragraph into sentences (and too long sentences into words)."""
+    for text, block_start, _, section, new_section in iter_blocks(path):
+        first = True
+        for match in SENTENCE_RE.finditer(text):
+            sentence = " ".join(match.group(0).split())
+            tokens = count_tokens(sentence)
+            pieces = [(sentence, match.start(), match.end(), tokens)]
+            if tokens > max_tokens:
+                words = sentence.split()
+                step = max(1, int(len(words) * max_tokens / tokens))
+                pieces = [(" ".join(words[i:i + step]), match.start(), match.end(), count_tokens(" ".join(words[i:i + step])))
+                          for i in range(0, len(words), step)]
+            for piece, s, e, n in pieces:
+                yield Unit(piece, block_start + s, block_start + e, section, new_section and first, n)
+                first = False
+
+
+def chunk_file(path, max_tokens=200, overlap_tokens=40) -> Iterator[Chunk]:
+    """Yield chunks of at most max_tokens that end on sentence boundaries and,
+    when possible, start at a new section. Consecutive chunks share up to
+    overlap_tokens of trailing sentences."""
+    current: List[Unit] = []
+    size = 0
+
+    def emit():
+        return Chunk(
+            text=" ".join(unit.text for unit in current),
+            start=current[0].start,
+            end=current[-1].end,
+            section=current[0].section,
+            tokens=size,
+        )
+
+    for unit in iter_units(path, max_tokens):
+        section_break = unit.new_section and size >= max_tokens // 2
+        if current and (size + unit.tokens > max_tokens or section_break):
+            yield emit()
+            if section_break:
+                current, size = [], 0
+            else:
+                # Keep the last sentences as overlap for the next chunk
+                overlap, overlap_size = [], 0
+                for prev in reversed(current):
+                    if overlap_size + prev.tokens > overlap_tokens:
+                        break
+                    overlap.insert(0, prev)
+                    overlap_size += prev.tokens
+                while overlap and overlap_size + unit.tokens > max_tokens:
+                    overlap_size -= overlap.pop(0).tokens
+                current, size = overlap, overlap_size
+        current.append(unit)
+        size += unit.tokens
+
+    if current:
+        yield emit()
+
+
+def chunk_records(file_path, max_tokens=200, overlap_tokens=40):
+    # Chunks follow headings, paragraphs and sentences; the metadata lets
+    # answers point back to the source section
+    for chunk in chunk_file(file_path, max_tokens=max_tokens, overlap_tokens=overlap_tokens):
+        yield {
+            "chunk_text": chunk.text,
+            "source": os.path.basename(file_path),
+            "section": " > ".join(chunk.section),
+            "start_offset": chunk.start,
+            "end_offset": chunk.end,
+        }
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class VectorStore(ABC):
+    """What the ingestion pipeline needs from a vector database."""
+
+    @abstractmethod
+    def upsert_records(self, namespace, records):
+        ...
+
+    @abstractmethod
+    def delete(self, namespace, ids):
+        ...
+
+    @abstractmethod
+    def delete_namespace(self, namespace):
+        ...
+
+    @abstractmethod
+    def fetch(self, namespace, ids):
+        """Return {id: fields} for the given ids that are visible to queries."""
+
+    @abstractmethod
+    def namespace_counts(self):
+        """Return {namespace: number of records visible to queries}."""
+
+
+class PineconeStore(VectorStore):
+    def __init__(self, index):
+        self.index = index
+
+    def upsert_records(self, namespace, records):
+        self.index.upsert_records(namespace, records)
+
+    def delete(self, namespace, ids):
+        self.index.delete(ids=ids, namespace=namespace)
+
+    def delete_namespace(self, namespace):
+        self.index.delete(delete_all=True, namespace=namespace)
+
+    def fetch(self, namespace, ids):
+        response = self.index.fetch(ids=ids, namespace=namespace)
+        return {record_id: dict(vector.metadata or {}) for record_id, vector in response.vectors.items()}
+
+    def namespace_counts(self):
+        stats = self.index.describe_index_stats()
+        namespaces = stats["namespaces"] or {}
+        return {name: summary["vector_count"] for name, summary in namespaces.items()}
+
+
+class InMemoryVectorStore(VectorStore):
+    """In-process fake, handy for trying the pipeline without Pinecone.
+
+    Every fail_every-th upsert raises, and writes only become visible lag
+    seconds later, like in Pinecone."""
+
+    def __init__(self, fail_every=0, lag=0.0):
+        self.namespaces = {}
+        self.calls = 0
+        self.fail_every = fail_every
+        self.lag = lag
+        self.pending = []  # (visible at, write) in write order
+        self.lock = threading.Lock()
+
+    def write(self, apply):
+        self.pending.append((time.monotonic() + self.lag, apply))
+
+    def visible(self):
+        # Apply the writes whose lag has passed
+        now = time.monotonic()
+        while self.pending and self.pending[0][0] <= now:
+            self.pending.pop(0)[1]()
+        return self.namespaces
+
+    def upsert_records(self, namespace, records):
+        with self.lock:
+            self.calls += 1
+            if self.fail_every and self.calls % self.fail_every == 0:
+                raise ConnectionError("simulated failure")
+            records = [dict(record) for record in records]
+
+            def apply():
+                stored = self.namespaces.setdefault(namespace, {})
+                for record in records:
+                    stored[record["_id"]] = record
+
+            self.write(apply)
+
+    def delete(self, namespace, ids):
+        with self.lock:
+            ids = list(ids)
+
+            def apply():
+                for record_id in ids:
+                    self.namespaces.get(namespace, {}).pop(record_id, None)
+
+            self.write(apply)
+
+    def delete_namespace(self, namespace):
+        with self.lock:
+            self.write(lambda: self.namespaces.pop(namespace, None))
+
+    def fetch(self, namespace, ids):
+        with self.lock:
+            stored = self.visible().get(namespace, {})
+            return {record_id: stored[record_id] for record_id in ids if record_id in stored}
+
+    def namespace_counts(self):
+        with self.lock:
+            return {name: len(records) for name, records in self.visible().items() if records}
+
+
+def with_retry(func, attempts=5, base_delay=0.5, max_delay=10):
+    # Exponential backoff with jitter
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+            print(f"Retrying after error: {e} (waiting {delay:.1f}s)")
+            time.sleep(delay)
+
+
+def make_batches(records, max_records=96, max_bytes=2_000_000):
+    # Pinecone limits both the number of records and the request size
+    batch, size = [], 0
+    for record in records:
+        record_size = len(json.dumps(record).encode())
+        if batch and (len(batch) >= max_records or size + record_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(record)
+        size += record_size
+    if batch:
+        yield batch
+
+
+class IngestionPipeline:
+    """Loads every .txt file in a folder into the vector store.
+
+    Files are chunked in parallel, unchanged files (same content hash as the
+    last run) are skipped, records are upserted in size-limited batches by a
+    few worker threads with retries, and wait_until_ready() polls the index
+    stats instead of sleeping for a fixed time.
+    """
+
+    def __init__(self, store, chunker, data_dir="data", manifest_path=".ingest_manifest.json",
+                 max_workers=4, max_records_per_batch=96, chunker_version="1"):
+        self.store = store
+        self.chunker = chunker
+        self.data_dir = data_dir
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers
+        self.max_records_per_batch = max_records_per_batch
+        # Change the version when the chunking changes, so every file is re-ingested
+        self.chunker_version = chunker_version
+        self.manifest = self.load_manifest()
+        self.counts = {}
+
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {}
+
+    def save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def file_hash(self, path):
+        # Hash in blocks so big files are never loaded whole
+        digest = hashlib.sha256(self.chunker_version.encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def prepare_file(self, file_name):
+        namespace = os.path.splitext(file_name)[0]  # namespace = file name without extension
+        path = os.path.join(self.data_dir, file_name)
+        digest = self.file_hash(path)
+        done = self.manifest.get(file_name, {})
+        # Skip unchanged files, unless the store lost their records (e.g. the
+        # local index was rebuilt for another embedder)
+        if done.get("hash") == digest and self.counts.get(namespace, 0) >= done.get("records", 0):
+            return None
+
+        # The chunker gets the file path and yields plain strings or dicts
+        # with "chunk_text" plus metadata fields
+        records = []
+        for i, chunk in enumerate(self.chunker(path)):
+            fields = chunk if isinstance(chunk, dict) else {"chunk_text": chunk}
+            # Ids depend only on the position, so re-ingesting a file overwrites
+            # its records; ingest_hash tells wait_until_ready() which version is visible
+            records.append({"_id": f"{namespace}-{i}", **fields, "category": namespace, "ingest_hash": digest[:16]})
+        return file_name, namespace, digest, records
+
+    def run(self):
+        files = sorted(f for f in os.listdir(self.data_dir) if f.endswith(".txt"))
+        self.counts = self.store.namespace_counts()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            prepared = [p for p in pool.map(self.prepare_file, files) if p is not None]
+
+            if not prepared:
+                print("All files are up to date, nothing to ingest")
+                return {}
+
+            for file_name, namespace, digest, records in prepared:
+                # A namespace this pipeline has not written yet may hold records
+                # with other ids (e.g. the old rec1, rec2, ... ids), clear it first
+                if file_name not in self.manifest and self.counts.get(namespace, 0):
+                    with_retry(lambda n=namespace: self.store.delete_namespace(n))
+
+            jobs = []
+            for file_name, namespace, digest, records in prepared:
+                for batch in make_batches(records, self.max_records_per_batch):
+                    jobs.append(pool.submit(with_retry, lambda n=namespace, b=batch: self.store.upsert_records(n, b)))
+            for job in jobs:
+                job.result()
+
+        expected = {}
+        for file_name, namespace, digest, records in prepared:
+            # Remove records left over from a longer, older version of the file
+            old_count = self.manifest.get(file_name, {}).get("records", 0)
+            if old_count > len(records):
+                stale = [f"{namespace}-{i}" for i in range(len(records), old_count)]
+                with_retry(lambda: self.store.delete(namespace, stale))
+            self.manifest[file_name] = {"hash": digest, "records": len(records)}
+            expected[namespace] = {"records": len(records), "ingest_hash": digest[:16]}
+            print(f"Upserted {len(records)} records to namespace '{namespace}'")
+
+        self.save_manifest()
+        return expected
+
+    def is_ready(self, namespace, expected, counts):
+        if counts.get(namespace, 0) != expected["records"]:
+            return False
+        if not expected["records"]:
+            return True
+        # Overwritten records do not change the count, so check that the first
+        # and last record of this run are visible in their new version
+        ids = [f"{namespace}-0", f"{namespace}-{expected['records'] - 1}"]
+        fetched = self.store.fetch(namespace, ids)
+        return all(fetched.get(i, {}).get("ingest_hash") == expected["ingest_hash"] for i in ids)
+
+    def wait_until_ready(self, expected, timeout=120, interval=0.5, max_interval=5):
+        """Poll the index until every namespace shows exactly what run() wrote."""
+        deadline = time.monotonic() + timeout
+        while True:
+            counts = self.store.namespace_counts()
+            if all(self.is_ready(ns, e, counts) for ns, e in expected.items()):
+                return counts
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Index not ready after {timeout}s: {counts}")
+            time.sleep(interval)
+            interval = min(max_interval, interval * 2)
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import numpy as np
+from ingestion import VectorStore
+
+
+class HashingEmbedder:
+    """Dependency-free embedding: hashed word unigrams and bigrams, L2 normalised.
+
+    Used when sentence-transformers is not installed."""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"\w+", text.lower())
+            for token in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+                vectors[row, h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name="all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers/{model_name}"
+
+    def embed(self, texts):
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def default_embedder():
+    try:
+        return SentenceTransformerEmbedder()
+    except Exception:
+        return HashingEmbedder()
+
+
+def write_json(path, data):
+    # Write to a temp file first so a crash never leaves half a file behind
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def kmeans(vectors, k, iterations=20, seed=0):
+    # Spherical k-means, good enough to build IVF cells
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(k):
+            members = vectors[assignment == c]
+            if len(members):
+                centroid = members.sum(axis=0)
+                centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+class NamespaceIndex:
+    """Vectors of one namespace, searched by exact (flat) inner product, or
+    through IVF cells once the namespace has more than ivf_threshold vectors.
+
+    embedder.json records which embedder built the vectors; a namespace built
+    by another embedder (or dimension) is discarded so it gets re-ingested."""
+
+    def __init__(self, directory, embedder_info, ivf_threshold=10_000, nprobe=8):
+        self.directory = directory
+        self.embedder_info = embedder_info
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.load()
+
+    def clear(self):
+        self.records = []
+        self.positions = {}
+        self.vectors = None
+        self.buffer = None
+        self.centroids = None
+        self.cells = None
+
+    def load(self):
+        self.clear()
+        records_path = os.path.join(self.directory, "records.json")
+        if not os.path.exists(records_path):
+            return
+        embedder_path = os.path.join(self.directory, "embedder.json")
+        built_with = None
+        if os.path.exists(embedder_path):
+            with open(embedder_path) as f:
+                built_with = json.load(f)
+        if built_with != self.embedder_info:
+            print(f"{self.directory} was built with {built_with}, the current embedder is "
+                  f"{self.embedder_info}; discarding it so it is rebuilt")
+            for name in ("records.json", "vectors.npy", "ivf.npz", "embedder.json"):
+                if os.path.exists(os.path.join(self.directory, name)):
+                    os.remove(os.path.join(self.directory, name))
+            return
+
+        with open(records_path) as f:
+            self.records = json.load(f)
+        self.positions = {record["_id"]: i for i, record in enumerate(self.records)}
+        # Memory-mapped: opening the index is instant and pages load on demand
+        self.vectors = np.load(os.path.join(self.directory, "vectors.npy"), mmap_mode="r")
+        ivf_path = os.path.join(self.directory, "ivf.npz")
+        if os.path.exists(ivf_path):
+            ivf = np.load(ivf_path)
+            self.centroids, self.cells = ivf["centroids"], ivf["cells"]
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        vectors = np.asarray(self.vectors if self.vectors is not None else np.zeros((0, self.embedder_info["dim"]), np.float32))
+        self.build_ivf(vectors)
+        np.save(os.path.join(self.directory, "vectors.npy.tmp.npy"), vectors)
+        os.replace(os.path.join(self.directory, "vectors.npy.tmp.npy"), os.path.join(self.directory, "vectors.npy"))
+        ivf_path = os.path.join(self.directory, "ivf.npz")
+        if self.centroids is not None:
+            np.savez(ivf_path + ".tmp.npz", centroids=self.centroids, cells=self.cells)
+            os.replace(ivf_path + ".tmp.npz", ivf_path)
+        elif os.path.exists(ivf_path):
+            os.remove(ivf_path)
+        write_json(os.path.join(self.directory, "embedder.json"), self.embedder_info)
+        # records.json last: it is what load() looks for
+        write_json(os.path.join(self.directory, "records.json"), self.records)
+        self.load()
+
+    def build_ivf(self, vectors):
+        if len(vectors) <= self.ivf_threshold:
+            self.centroids = self.cells = None
+            return
+        k = int(np.sqrt(len(vectors)))
+        self.centroids, self.cells = kmeans(np.asarray(vectors, dtype=np.float32), k)
+
+    def reserve(self, count, dim):
+        # The first change copies the memory-mapped vectors into a writable
+        # buffer, which doubles when it is full, so batched upserts cost O(n)
+        # overall instead of copying every vector on every batch
+        if self.buffer is not None and len(self.buffer) >= count:
+            return
+        capacity = max(count, 2 * (len(self.buffer) if self.buffer is not None else 0), 1024)
+        buffer = np.empty((capacity, dim), dtype=np.float32)
+        if self.records:
+            buffer[: len(self.records)] = self.vectors[: len(self.records)]
+        self.buffer = buffer
+
+    def upsert(self, records, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.reserve(len(self.records) + len(records), vectors.shape[1])
+        for record, vector in zip(records, vectors):
+            position = self.positions.get(record["_id"])
+            if position is None:
+                position = len(self.records)
+                self.positions[record["_id"]] = position
+                self.records.append(record)
+            else:
+                self.records[position] = record
+            self.buffer[position] = vector
+        self.vectors = self.buffer[: len(self.records)]
+        self.centroids = self.cells = None
+
+    def delete(self, ids):
+        ids = set(ids)
+        keep = [i for i, record in enumerate(self.records) if record["_id"] not in ids]
+        if len(keep) == len(self.records):
+            return
+        self.records = [self.records[i] for i in keep]
+        self.positions = {record["_id"]: i for i, record in enumerate(self.records)}
+        self.buffer = np.array(self.vectors)[keep] if self.vectors is not None else None
+        self.vectors = self.buffer
+        self.centroids = self.cells = None
+
+    def search(self, query_vector, top_k):
+        if not self.records:
+            return []
+        if self.centroids is not None:
+            # Only score the vectors in the nprobe closest cells
+            probe = np.argsort(-(self.centroids @ query_vector))[: self.nprobe]
+            candidates = np.flatnonzero(np.isin(self.cells, probe))
+            if len(candidates) == 0:
+                return []
+            scores = self.vectors[candidates] @ query_vector
+        else:
+            candidates = np.arange(len(self.records))
+            scores = self.vectors @ query_vector
+        top_k = min(top_k, len(candidates))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.records[candidates[i]], float(scores[i])) for i in best]
+
+
+class LocalVectorIndex(VectorStore):
+    """In-process replacement for the Pinecone index, one folder per namespace.
+
+    It implements the same VectorStore interface as PineconeStore, so the
+    ingestion pipeline can fill it, and search() returns hits in the same shape
+    as Pinecone's index.search(). Changes are written to disk by save(), which
+    namespace_counts() calls, so wait_until_ready() also persists the index."""
+
+    def __init__(self, directory="local_index", embedder=None, text_field="chunk_text"):
+        self.directory = directory
+        self.embedder = embedder or default_embedder()
+        self.embedder_info = {"name": self.embedder.name, "dim": self.embedder.dim}
+        self.text_field = text_field
+        self.namespaces = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                self.namespace(name)
+
+    def namespace(self, name):
+        if name not in self.namespaces:
+            self.namespaces[name] = NamespaceIndex(os.path.join(self.directory, name), self.embedder_info)
+        return self.namespaces[name]
+
+    def upsert_records(self, namespace, records):
+        vectors = self.embedder.embed([record[self.text_field] for record in records])
+        with self.lock:
+            self.namespace(namespace).upsert(records, vectors)
+            self.dirty.add(namespace)
+
+    def delete(self, namespace, ids):
+        with self.lock:
+            self.namespace(namespace).delete(ids)
+            self.dirty.add(namespace)
+
+    def delete_namespace(self, namespace):
+        with self.lock:
+            index = self.namespace(namespace)
+            index.delete([record["_id"] for record in index.records])
+            self.dirty.add(namespace)
+
+    def fetch(self, namespace, ids):
+        with self.lock:
+            index = self.namespaces.get(namespace)
+            if index is None:
+                return {}
+            return {i: index.records[index.positions[i]] for i in ids if i in index.positions}
+
+    def save(self):
+        with self.lock:
+            for name in self.dirty:
+                self.namespaces[name].save()
+            self.dirty.clear()
+
+    def namespace_counts(self):
+        self.save()
+        return {name: len(index.records) for name, index in self.namespaces.items()}
+
+    def search(self, namespace, query, top_k=5):
+        index = self.namespaces.get(namespace)
+        if index is None:
+            return {"result": {"hits": []}}
+        query_vector = self.embedder.embed([query])[0]
+        hits = [
+            {
+                "_id": record["_id"],
+                "_score": score,
+                "fields": {k: v for k, v in record.items() if k != "_id"},
+            }
+            for record, score in index.search(query_vector, top_k)
+        ]
+        return {"result": {"hits": hits}}
@@ -0,0 +1,148 @@
+"""Check EmailReader against a fake IMAP server, no mailbox needed.
+
+Covers the SQLite cache keyed by folder, UIDVALIDITY and UID, header-only
+reads, reconnecting after a dropped connection, and that concurrent reads never
+use the shared IMAP connection at the same time.
+
+    python check_email_reader.py
+"""
+import imaplib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from email_reader import EmailReader, MessageCache
+
+
+class FakeMailbox:
+    def __init__(self, count=5):
+        self.uid_validity = 1
+        self.messages = {uid: f"body {uid}" for uid in range(1, count + 1)}
+        self.fetches = []  # (uid set, headers only) of every UID FETCH
+        self.logins = 0
+
+    def renumber(self):
+        # What a server does when a folder is recreated: new UIDVALIDITY, new contents
+        self.uid_validity += 1
+        self.messages = {uid: f"new body {uid}" for uid in self.messages}
+
+
+class FakeIMAP:
+    """Just enough of imaplib.IMAP4 for EmailReader. Raises if two threads use
+    the connection at the same time."""
+
+    def __init__(self, mailbox):
+        self.mailbox = mailbox
+        self.busy = threading.Lock()
+        self.alive = True
+
+    def command(self):
+        if not self.busy.acquire(blocking=False):
+            raise AssertionError("IMAP connection used by two threads at once")
+        time.sleep(0.005)
+        self.busy.release()
+        if not self.alive:
+            raise imaplib.IMAP4.abort("connection closed")
+
+    def login(self, address, password):
+        self.command()
+        self.mailbox.logins += 1
+
+    def noop(self):
+        self.command()
+        return "OK", [b""]
+
+    def select(self, folder, readonly=False):
+        self.command()
+        return "OK", [str(len(self.mailbox.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self.mailbox.uid_validity).encode()]
+
+    def uid(self, command, *args):
+        self.command()
+        if command == "SEARCH":
+            return "OK", [" ".join(str(uid) for uid in self.mailbox.messages).encode()]
+
+        uid_set, items = args
+        headers_only = "BODY.PEEK[TEXT]" not in items
+        self.mailbox.fetches.append((uid_set, headers_only))
+        data = []
+        for number, uid in enumerate(int(u) for u in uid_set.split(",")):
+            header = f"From: a{uid}@example.com\r\nSubject: Mail {uid}\r\nDate: Mon, 1 Jan 2024 10:00:00 +0000\r\n\r\n".encode()
+            data.append((f"{number + 1} (UID {uid} BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {{{len(header)}}}".encode(), header))
+            if not headers_only:
+                text = self.mailbox.messages[uid].encode()
+                data.append((f" BODY[TEXT]<0> {{{len(text)}}}".encode(), text))
+            data.append(b")")
+        return "OK", data
+
+    def logout(self):
+        self.alive = False
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="email_check_")
+    try:
+        mailbox = FakeMailbox()
+        connections = []
+
+        def factory(server):
+            connections.append(FakeIMAP(mailbox))
+            return connections[-1]
+
+        reader = EmailReader("imap.example.com", "me", "secret",
+                             cache=MessageCache(os.path.join(directory, "cache.db")), imap_factory=factory)
+
+        emails = reader.read(max_emails=3)
+        assert [e["subject"] for e in emails] == ["Mail 5", "Mail 4", "Mail 3"], emails
+        assert emails[0]["body"] == "body 5"
+        assert mailbox.fetches == [("5,4,3", False)], mailbox.fetches
+        print("first read: one UID FETCH for 3 messages")
+
+        reader.read(max_emails=3)
+        assert len(mailbox.fetches) == 1, mailbox.fetches
+        reader.read(max_emails=5)
+        assert mailbox.fetches[-1] == ("2,1", False), mailbox.fetches
+        print("second read: served from the cache, only new UIDs fetched")
+
+        headers = reader.read(max_emails=2, headers_only=True)
+        assert headers[0]["body"] is None and mailbox.fetches[-1] == ("5,4", True)
+        print("header-only read: no body fetched")
+
+        # A new UIDVALIDITY means the cached UIDs may point to other messages
+        mailbox.renumber()
+        connections[-1].alive = False
+        emails = reader.read(max_emails=2)
+        assert mailbox.logins == 2, mailbox.logins
+        assert [e["body"] for e in emails] == ["new body 5", "new body 4"], emails
+        assert mailbox.fetches[-1] == ("5,4", False), mailbox.fetches
+        print("UIDVALIDITY changed: reconnected and re-fetched instead of using stale cache")
+
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(5):
+                    reader.read(max_emails=5)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors
+        print("8 threads reading at once: the connection was never shared mid-command")
+
+        reader.close()
+        print("OK")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import email
+import imaplib
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from email.header import decode_header, make_header
+
+HEADER_FIELDS = "FROM SUBJECT DATE CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+BODY_BYTES = 2048
+
+
+def decode_mime_header(value):
+    if not value:
+        return ""
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return value
+
+
+def extract_text(message):
+    # The body may be cut off after BODY_BYTES, the email parser still finds
+    # the first text/plain part of a truncated multipart message
+    if message.is_multipart():
+        for part in message.walk():
+            if part.get_content_type() == "text/plain" and "attachment" not in str(part.get("Content-Disposition")):
+                payload = part.get_payload(decode=True) or b""
+                return payload.decode(part.get_content_charset() or "utf-8", errors="ignore")
+        return ""
+    payload = message.get_payload(decode=True) or b""
+    return payload.decode(message.get_content_charset() or "utf-8", errors="ignore")
+
+
+def parse_fetch_response(data):
+    """Turn an imaplib UID FETCH response into {uid: {"header": ..., "text": ...}}."""
+    messages = {}
+    current = None
+    for item in data:
+        meta = item[0] if isinstance(item, tuple) else item
+        if not isinstance(meta, bytes):
+            continue
+        # "12 (UID 345 BODY[...] {100}" starts a new message
+        if re.match(rb"^\d+ \(", meta):
+            current = {"uid": None, "header": b"", "text": b""}
+        if current is None:
+            continue
+        uid = re.search(rb"UID (\d+)", meta)
+        if uid:
+            current["uid"] = int(uid.group(1))
+            messages[current["uid"]] = current
+        if isinstance(item, tuple):
+            if b"HEADER" in meta:
+                current["header"] = item[1]
+            elif b"BODY[TEXT]" in meta:
+                current["text"] = item[1]
+    return messages
+
+
+class MessageCache:
+    """Parsed messages stored in SQLite, keyed by folder, UIDVALIDITY and UID."""
+
+    def __init__(self, path="email_cache.db"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    folder TEXT NOT NULL,
+                    uid_validity INTEGER NOT NULL,
+                    uid INTEGER NOT NULL,
+                    sender TEXT,
+                    subject TEXT,
+                    date TEXT,
+                    body TEXT,
+                    PRIMARY KEY (folder, uid_validity, uid)
+                )
+            """)
+
+    def get_many(self, folder, uid_validity, uids):
+        if not uids:
+            return {}
+        placeholders = ", ".join("?" for _ in uids)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT uid, sender, subject, date, body FROM messages "
+                f"WHERE folder = ? AND uid_validity = ? AND uid IN ({placeholders})",
+                (folder, uid_validity, *uids),
+            ).fetchall()
+        return {
+            uid: {"from": sender, "subject": subject, "date": date, "body": body}
+            for uid, sender, subject, date, body in rows
+        }
+
+    def put_many(self, folder, uid_validity, messages):
+        # Header-only results are not cached, a later full read must fetch the body
+        rows = [
+            (folder, uid_validity, uid, m["from"], m["subject"], m["date"], m["body"])
+            for uid, m in messages.items()
+            if m.get("body") is not None
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+
+class EmailReader:
+    """Reads mail over one logged-in IMAP connection that is reused between calls.
+
+    Messages are fetched with a single UID FETCH for the whole UID set and only
+    the headers and the first BODY_BYTES of the body are downloaded.
+    """
+
+    def __init__(self, server, address, password, cache=None, imap_factory=imaplib.IMAP4_SSL):
+        self.server = server
+        self.address = address
+        self.password = password
+        self.cache = cache
+        self.imap_factory = imap_factory
+        self.imap = None
+        self.folder = None
+        self.uid_validity = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        self.imap = self.imap_factory(self.server)
+        self.imap.login(self.address, self.password)
+        self.folder = None
+
+    def ensure_connected(self):
+        if self.imap is not None:
+            try:
+                self.imap.noop()
+                return
+            except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError):
+                self.imap = None
+        self.connect()
+
+    def select(self, folder):
+        if folder == self.folder:
+            return
+        status, _ = self.imap.select(folder, readonly=True)
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"Could not select folder {folder}")
+        _, values = self.imap.response("UIDVALIDITY")
+        self.uid_validity = int(values[0]) if values and values[0] else 0
+        self.folder = folder
+
+    def read(self, folder="INBOX", days=7, max_emails=10, headers_only=False):
+        with self.lock:
+            self.ensure_connected()
+            self.select(folder)
+
+            date_since = (datetime.now() - timedelta(days=days)).strftime('%d-%b-%Y')
+            status, data = self.imap.uid("SEARCH", None, f'(SINCE "{date_since}")')
+            if status != "OK":
+                raise imaplib.IMAP4.error("Error searching emails")
+
+            # Limit to the most recent `max_emails`, newest first
+            uids = [int(uid) for uid in data[0].split()][-max_emails:][::-1]
+
+            cached = {}
+            if self.cache is not None and not headers_only:
+                cached = self.cache.get_many(folder, self.uid_validity, uids)
+            missing = [uid for uid in uids if uid not in cached]
+
+            fetched = self.fetch(missing, headers_only) if missing else {}
+            if self.cache is not None and not headers_only:
+                self.cache.put_many(folder, self.uid_validity, fetched)
+
+        messages = {**cached, **fetched}
+        return [messages[uid] for uid in uids if uid in messages]
+
+    def fetch(self, uids, headers_only):
+        items = f"UID BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})]"
+        if not headers_only:
+            items += f" BODY.PEEK[TEXT]<0.{BODY_BYTES}>"
+        uid_set = ",".join(str(uid) for uid in uids)
+
+        status, data = self.imap.uid("FETCH", uid_set, f"({items})")
+        if status != "OK":
+            raise imaplib.IMAP4.error("Error fetching emails")
+
+        messages = {}
+        for uid, raw in parse_fetch_response(data).items():
+            msg = email.message_from_bytes(raw["header"] + b"\r\n" + raw["text"])
+            messages[uid] = {
+                "from": decode_mime_header(msg.get("From")),
+                "subject": decode_mime_header(msg.get("Subject")),
+                "date": msg.get("Date"),
+                "body": None if headers_only else extract_text(msg).strip(),
+            }
+        return messages
+
+    def close(self):
+        with self.lock:
+            if self.imap is not None:
+                try:
+                    self.imap.logout()
+                except Exception:
+                    pass
+                self.imap = None
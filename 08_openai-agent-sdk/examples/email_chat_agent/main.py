@@ -1,14 +1,16 @@
 from openai import AsyncOpenAI
-from agents import Agent, OpenAIChatCompletionsModel, Runner, function_tool
+from agents import Agent, OpenAIChatCompletionsModel, Runner
 import os
+import sys
 from dotenv import load_dotenv
-import imaplib
-import email
-from email.header import decode_header
-from datetime import datetime, timedelta
 import smtplib
 from email.message import EmailMessage
 import mimetypes
+from email_reader import EmailReader, MessageCache
+
+# Shared tool wrapper from 08_openai-agent-sdk/tool_executor.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from tool_executor import threaded_tool, print_tool_stats
 
 load_dotenv()
 
@@ -19,6 +21,9 @@ imap_server = "imap.gmail.com"
 smtp_server = "smtp.gmail.com"
 smtp_port = 587
 
+# One IMAP login reused by every read_emails call, parsed messages cached on disk
+email_reader = EmailReader(imap_server, email_address, app_password, cache=MessageCache("email_cache.db"))
+
 client = AsyncOpenAI(
     api_key=gemini_api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
@@ -58,12 +63,13 @@ You are a smart and professional Email Agent. Your primary role is to manage and
 
 You can access two tools to perform actions:
 
-#### 1. `read_emails(folder="INBOX", days=7, max_emails=10)`
+#### 1. `read_emails(folder="INBOX", days=7, max_emails=10, headers_only=False)`
 
 Use this tool to fetch recent emails from the user's inbox (or other folders like "Spam"). You should:
 
 * Read only the number of emails needed for the task.
 * Choose the appropriate folder (default: "INBOX").
+* Use `headers_only=True` when sender and subject are enough (e.g. listing or triaging mail).
 * Avoid fetching unnecessary messages — always use the minimal value of `max_emails` for efficiency.
 * Parse the subject, sender, and body of the email to help the user quickly understand its purpose.
 
@@ -125,77 +131,36 @@ Make the user’s email experience fast, clear, and intelligent. Reduce manual w
 
 """
 
-@function_tool
+# IMAP and SMTP calls run in the tool thread pool, not on the event loop
+@threaded_tool(timeout=60)
 def read_emails(
     folder: str = "INBOX",
     days: int = 7,
-    max_emails: int = 10
+    max_emails: int = 10,
+    headers_only: bool = False
 ):
     """
     Read emails using IMAP.
     
     Parameters:
-    - email_address: your email address
-    - app_password: app-specific password or actual password (if allowed)
-    - imap_server: IMAP server, e.g., imap.gmail.com
     - folder: Mailbox folder, e.g., INBOX, Spam
     - days: Number of past days to fetch emails from
     - max_emails: Maximum number of emails to fetch
+    - headers_only: Only fetch sender, subject and date (faster)
     """
     try:
-        # Connect and login
-        imap = imaplib.IMAP4_SSL(imap_server)
-        imap.login(email_address, app_password)
-
-        # Select the folder
-        imap.select(folder)
-
-        # Compute date N days ago
-        date_since = (datetime.now() - timedelta(days=days)).strftime('%d-%b-%Y')
-
-        # Search emails since the given date
-        status, messages = imap.search(None, f'(SINCE "{date_since}")')
-        if status != "OK":
-            print("Error searching emails")
-            return []
-
-        email_ids = messages[0].split()
-        email_ids = email_ids[-max_emails:]  # Limit to most recent `max_emails`
-        emails = []
-
-        for eid in reversed(email_ids):
-            status, msg_data = imap.fetch(eid, "(RFC822)")
-            for part in msg_data:
-                if isinstance(part, tuple):
-                    msg = email.message_from_bytes(part[1])
-                    subject, encoding = decode_header(msg["Subject"])[0]
-                    if isinstance(subject, bytes):
-                        subject = subject.decode(encoding or "utf-8", errors="ignore")
-                    from_ = msg.get("From")
-
-                    body = ""
-                    if msg.is_multipart():
-                        for subpart in msg.walk():
-                            if subpart.get_content_type() == "text/plain" and "attachment" not in str(subpart.get("Content-Disposition")):
-                                body = subpart.get_payload(decode=True).decode(errors="ignore")
-                                break
-                    else:
-                        body = msg.get_payload(decode=True).decode(errors="ignore")
-
-                    emails.append({
-                        "from": from_,
-                        "subject": subject,
-                        "body": body.strip()[:500],  # Truncate to first 500 chars
-                    })
-        
-        imap.logout()
+        emails = email_reader.read(folder, days, max_emails, headers_only)
+        for message in emails:
+            if message["body"] is not None:
+                message["body"] = message["body"][:500]  # Truncate to first 500 chars
         return emails
     
     except Exception as e:
         print("Error:", e)
         return []
 
-@function_tool
+# No timeout: a mail that is still being sent must not be retried by the agent
+@threaded_tool(timeout=None)
 def send_email(
     recipient_email: str,
     subject: str,
@@ -264,6 +229,11 @@ while True:
 
     query = input("Enter the query: ")
 
+    # Type "stats" to see how long each tool took
+    if query.strip() == "stats":
+        print_tool_stats()
+        continue
+
     history.append({"role": "user", "content": query})
 
     result = Runner.run_sync(
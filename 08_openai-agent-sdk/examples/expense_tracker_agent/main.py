@@ -1,11 +1,18 @@
 import os
+import sys
 from dotenv import load_dotenv
 import psycopg2
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Dict, Optional
-from agents import Agent, OpenAIChatCompletionsModel, function_tool, Runner
+from agents import Agent, OpenAIChatCompletionsModel, Runner
 from openai import AsyncOpenAI
 
+# Shared tool wrapper from 08_openai-agent-sdk/tool_executor.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from tool_executor import threaded_tool, print_tool_stats
+
 load_dotenv()
 
 gemini_api_key = os.getenv('GEMINI_API_KEY')
@@ -21,39 +28,119 @@ model = OpenAIChatCompletionsModel(
     openai_client=client
 )
 
-# Database connection
-def get_db_connection():
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        raise ValueError("DATABASE_URL not found in .env file")
-    return psycopg2.connect(database_url)
+# Database connection pool, shared by all tool calls
+db_pool = None
+
+# Seconds a read-only database tool may take before the agent gets a timeout
+# error. Tools that write have no timeout: the write could still commit after
+# the agent was told it failed, and a retry would add it twice.
+DB_TOOL_TIMEOUT = float(os.getenv('DB_TOOL_TIMEOUT', '15'))
+
+# Queries that run on every call are prepared once per connection, so
+# Postgres only parses and plans them the first time
+PREPARED_STATEMENTS = {
+    "add_expense": """
+        PREPARE add_expense (numeric, text, varchar) AS
+        INSERT INTO expenses (amount, description, category)
+        VALUES ($1, $2, $3)
+        RETURNING id
+    """,
+    "delete_expense": """
+        PREPARE delete_expense (int) AS
+        DELETE FROM expenses WHERE id = $1 RETURNING id
+    """,
+    "search_expenses": """
+        PREPARE search_expenses (text) AS
+        SELECT * FROM expenses
+        WHERE description ILIKE $1
+        OR category ILIKE $1
+        ORDER BY created_at DESC
+    """,
+    # Totals and the category breakdown in one round trip, read from the
+    # daily rollups that setup_db.py keeps up to date with a trigger
+    "expense_summary": """
+        PREPARE expense_summary (date, date, varchar) AS
+        WITH filtered AS (
+            SELECT * FROM expense_daily_rollups
+            WHERE day >= $1 AND day <= $2
+            AND ($3::varchar IS NULL OR category = $3)
+        ),
+        by_category AS (
+            SELECT category, SUM(total_amount) AS total FROM filtered GROUP BY category
+        )
+        SELECT
+            COALESCE(SUM(expense_count), 0) as total_expenses,
+            SUM(total_amount) as total_amount,
+            SUM(total_amount) / NULLIF(SUM(expense_count), 0) as average_amount,
+            MIN(min_amount) as min_amount,
+            MAX(max_amount) as max_amount,
+            (SELECT COALESCE(json_object_agg(category, total ORDER BY total DESC), '{}')
+             FROM by_category) as category_breakdown
+        FROM filtered
+    """,
+}
+
+class PreparedConnection(psycopg2.extensions.connection):
+    # True once the statements above were prepared on this connection
+    prepared = False
+
+def get_db_pool():
+    global db_pool
+    if db_pool is None:
+        database_url = os.getenv('DATABASE_URL')
+        if not database_url:
+            raise ValueError("DATABASE_URL not found in .env file")
+        db_pool = ThreadedConnectionPool(
+            int(os.getenv('DB_POOL_MIN', '2')),
+            int(os.getenv('DB_POOL_MAX', '10')),
+            database_url,
+            connection_factory=PreparedConnection,
+        )
+    return db_pool
 
-@function_tool
+@contextmanager
+def get_db_cursor():
+    """Borrow a connection from the pool and give back a cursor.
+    Commits on success, rolls back on error and returns the connection."""
+    pool = get_db_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        if not conn.prepared:
+            with conn.cursor() as cur:
+                # Prepared statements are not rolled back with the transaction,
+                # so drop any left over from an earlier attempt that failed halfway
+                cur.execute("DEALLOCATE ALL")
+                for statement in PREPARED_STATEMENTS.values():
+                    cur.execute(statement)
+            conn.commit()
+            conn.prepared = True
+        with conn.cursor() as cur:
+            yield cur
+        conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # The connection is dead, drop it instead of putting it back
+        broken = True
+        raise
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=broken or bool(conn.closed))
+
+@threaded_tool(timeout=None)
 def add_expense(amount: float, description: str, category: str) -> str:
     """Add a new expense to the database."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        query = """
-        INSERT INTO expenses (amount, description, category)
-        VALUES (%s, %s, %s)
-        RETURNING id;
-        """
-        cur.execute(query, (amount, description, category))
-        expense_id = cur.fetchone()[0]
-        conn.commit()
-        
+        with get_db_cursor() as cur:
+            cur.execute("EXECUTE add_expense (%s, %s, %s)", (amount, description, category))
+            expense_id = cur.fetchone()[0]
+
         return f"Successfully added expense with ID: {expense_id}"
     except Exception as e:
         return f"Error adding expense: {str(e)}"
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-@function_tool
+@threaded_tool(timeout=DB_TOOL_TIMEOUT)
 def get_expenses(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -63,9 +150,6 @@ def get_expenses(
 ) -> List[Dict]:
     """Get expenses with optional filters."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
         query = "SELECT * FROM expenses WHERE 1=1"
         params = []
         
@@ -87,20 +171,16 @@ def get_expenses(
             
         query += " ORDER BY created_at DESC"
         
-        cur.execute(query, params)
-        columns = [desc[0] for desc in cur.description]
-        expenses = [dict(zip(columns, row)) for row in cur.fetchall()]
+        with get_db_cursor() as cur:
+            cur.execute(query, params)
+            columns = [desc[0] for desc in cur.description]
+            expenses = [dict(zip(columns, row)) for row in cur.fetchall()]
         
         return expenses
     except Exception as e:
         return [{"error": str(e)}]
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-@function_tool
+@threaded_tool(timeout=None)
 def update_expense(
     expense_id: int,
     amount: Optional[float] = None,
@@ -109,9 +189,6 @@ def update_expense(
 ) -> str:
     """Update an existing expense."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
         updates = []
         params = []
         
@@ -137,130 +214,77 @@ def update_expense(
         """
         params.append(expense_id)
         
-        cur.execute(query, params)
-        if cur.rowcount == 0:
-            return f"No expense found with ID: {expense_id}"
-            
-        conn.commit()
+        with get_db_cursor() as cur:
+            cur.execute(query, params)
+            if cur.rowcount == 0:
+                return f"No expense found with ID: {expense_id}"
+
         return f"Successfully updated expense with ID: {expense_id}"
     except Exception as e:
         return f"Error updating expense: {str(e)}"
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-@function_tool
+@threaded_tool(timeout=None)
 def delete_expense(expense_id: int) -> str:
     """Delete an expense by ID."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        query = "DELETE FROM expenses WHERE id = %s RETURNING id;"
-        cur.execute(query, (expense_id,))
-        
-        if cur.rowcount == 0:
-            return f"No expense found with ID: {expense_id}"
-            
-        conn.commit()
+        with get_db_cursor() as cur:
+            cur.execute("EXECUTE delete_expense (%s)", (expense_id,))
+            if cur.rowcount == 0:
+                return f"No expense found with ID: {expense_id}"
+
         return f"Successfully deleted expense with ID: {expense_id}"
     except Exception as e:
         return f"Error deleting expense: {str(e)}"
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-@function_tool
+@threaded_tool(timeout=DB_TOOL_TIMEOUT)
 def get_expense_summary(
     period: str = "month",
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
 ) -> Dict:
-    """Get summary of expenses for a given period."""
+    """Get summary of expenses for a given period ('week', 'month', 'year', or
+    'custom' with start_date and end_date as YYYY-MM-DD)."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
+        # Rollup days are UTC dates
+        today = datetime.now(timezone.utc).date()
+        end = today
         if period == "month":
-            start_date = datetime.now().replace(day=1)
+            start = today.replace(day=1)
         elif period == "week":
-            start_date = datetime.now() - timedelta(days=datetime.now().weekday())
+            start = today - timedelta(days=today.weekday())
         elif period == "year":
-            start_date = datetime.now().replace(month=1, day=1)
+            start = today.replace(month=1, day=1)
+        elif period == "custom":
+            if not start_date:
+                return {"error": "start_date is required for a custom period"}
+            start = date.fromisoformat(start_date)
+            if end_date:
+                end = date.fromisoformat(end_date)
         else:
-            return {"error": "Invalid period. Use 'week', 'month', or 'year'"}
-            
-        query = """
-        SELECT 
-            COUNT(*) as total_expenses,
-            SUM(amount) as total_amount,
-            AVG(amount) as average_amount,
-            MIN(amount) as min_amount,
-            MAX(amount) as max_amount
-        FROM expenses
-        WHERE created_at >= %s
-        """
-        params = [start_date]
-        
-        if category:
-            query += " AND category = %s"
-            params.append(category)
-            
-        cur.execute(query, params)
-        summary = dict(zip([desc[0] for desc in cur.description], cur.fetchone()))
-        
-        # Get category breakdown
-        category_query = """
-        SELECT category, SUM(amount) as total
-        FROM expenses
-        WHERE created_at >= %s
-        """
-        if category:
-            category_query += " AND category = %s"
-        category_query += " GROUP BY category ORDER BY total DESC"
-        
-        cur.execute(category_query, params)
-        summary['category_breakdown'] = dict(cur.fetchall())
+            return {"error": "Invalid period. Use 'week', 'month', 'year' or 'custom'"}
+
+        with get_db_cursor() as cur:
+            cur.execute("EXECUTE expense_summary (%s, %s, %s)", (start, end, category))
+            summary = dict(zip([desc[0] for desc in cur.description], cur.fetchone()))
         
         return summary
     except Exception as e:
         return {"error": str(e)}
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
-@function_tool
+@threaded_tool(timeout=DB_TOOL_TIMEOUT)
 def search_expenses(search_term: str) -> List[Dict]:
     """Search expenses by description or category."""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        query = """
-        SELECT * FROM expenses 
-        WHERE description ILIKE %s 
-        OR category ILIKE %s
-        ORDER BY created_at DESC
-        """
         search_pattern = f"%{search_term}%"
-        cur.execute(query, (search_pattern, search_pattern))
-        
-        columns = [desc[0] for desc in cur.description]
-        expenses = [dict(zip(columns, row)) for row in cur.fetchall()]
+        with get_db_cursor() as cur:
+            cur.execute("EXECUTE search_expenses (%s)", (search_pattern,))
+            columns = [desc[0] for desc in cur.description]
+            expenses = [dict(zip(columns, row)) for row in cur.fetchall()]
         
         return expenses
     except Exception as e:
         return [{"error": str(e)}]
-    finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
 
 agent = Agent(
     name="ExpenseTracker",
@@ -291,6 +315,11 @@ while True:
 
     query = input("Enter the query: ")
 
+    # Type "stats" to see how long each tool took
+    if query.strip() == "stats":
+        print_tool_stats()
+        continue
+
     history.append({"role": "user", "content": query})
 
     result = Runner.run_sync(
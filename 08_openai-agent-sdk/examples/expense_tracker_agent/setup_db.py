@@ -12,6 +12,8 @@ def setup_database():
     if not database_url:
         raise ValueError("DATABASE_URL not found in .env file")
 
+    conn = None
+    cur = None
     try:
         # Connect to the database
         conn = psycopg2.connect(database_url)
@@ -30,6 +32,106 @@ def setup_database():
         """
         
         cur.execute(create_table_query)
+
+        # Indexes for date filters, category filters and ILIKE search
+        create_indexes_query = """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS idx_expenses_created_at ON expenses (created_at);
+        CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses (category, created_at);
+        CREATE INDEX IF NOT EXISTS idx_expenses_description_trgm
+            ON expenses USING gin (description gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS idx_expenses_category_trgm
+            ON expenses USING gin (category gin_trgm_ops);
+        """
+
+        cur.execute(create_indexes_query)
+
+        # Per-day, per-category totals kept up to date by a trigger, so
+        # summaries read a few hundred rollup rows instead of every expense.
+        # Days are UTC dates.
+        create_rollups_query = """
+        CREATE TABLE IF NOT EXISTS expense_daily_rollups (
+            day DATE NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            expense_count INTEGER NOT NULL,
+            total_amount DECIMAL(14,2) NOT NULL,
+            min_amount DECIMAL(10,2) NOT NULL,
+            max_amount DECIMAL(10,2) NOT NULL,
+            PRIMARY KEY (day, category)
+        );
+
+        -- Recalculate one (day, category) group, used when a row is
+        -- updated or deleted (min/max can not be decremented)
+        CREATE OR REPLACE FUNCTION refresh_expense_rollup(p_day DATE, p_category VARCHAR)
+        RETURNS void AS $$
+        BEGIN
+            DELETE FROM expense_daily_rollups WHERE day = p_day AND category = p_category;
+            INSERT INTO expense_daily_rollups
+                (day, category, expense_count, total_amount, min_amount, max_amount)
+            SELECT p_day, p_category, COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+            FROM expenses
+            WHERE category = p_category
+            AND created_at >= p_day::timestamp AT TIME ZONE 'UTC'
+            AND created_at < (p_day + 1)::timestamp AT TIME ZONE 'UTC'
+            HAVING COUNT(*) > 0
+            ON CONFLICT (day, category) DO UPDATE SET
+                expense_count = EXCLUDED.expense_count,
+                total_amount = EXCLUDED.total_amount,
+                min_amount = EXCLUDED.min_amount,
+                max_amount = EXCLUDED.max_amount;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE OR REPLACE FUNCTION expenses_rollup_trigger()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                -- New expenses only add to the group
+                INSERT INTO expense_daily_rollups AS r
+                    (day, category, expense_count, total_amount, min_amount, max_amount)
+                VALUES ((NEW.created_at AT TIME ZONE 'UTC')::date, NEW.category,
+                        1, NEW.amount, NEW.amount, NEW.amount)
+                ON CONFLICT (day, category) DO UPDATE SET
+                    expense_count = r.expense_count + 1,
+                    total_amount = r.total_amount + EXCLUDED.total_amount,
+                    min_amount = LEAST(r.min_amount, EXCLUDED.min_amount),
+                    max_amount = GREATEST(r.max_amount, EXCLUDED.max_amount);
+                RETURN NEW;
+            END IF;
+
+            PERFORM refresh_expense_rollup((OLD.created_at AT TIME ZONE 'UTC')::date, OLD.category);
+
+            IF TG_OP = 'UPDATE' THEN
+                IF (NEW.created_at AT TIME ZONE 'UTC')::date <> (OLD.created_at AT TIME ZONE 'UTC')::date
+                   OR NEW.category <> OLD.category THEN
+                    PERFORM refresh_expense_rollup((NEW.created_at AT TIME ZONE 'UTC')::date, NEW.category);
+                END IF;
+                RETURN NEW;
+            END IF;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS expenses_rollup ON expenses;
+        CREATE TRIGGER expenses_rollup
+        AFTER INSERT OR UPDATE OR DELETE ON expenses
+        FOR EACH ROW EXECUTE FUNCTION expenses_rollup_trigger();
+        """
+
+        cur.execute(create_rollups_query)
+
+        # Fill the rollups from the expenses that already exist
+        backfill_rollups_query = """
+        TRUNCATE expense_daily_rollups;
+        INSERT INTO expense_daily_rollups
+            (day, category, expense_count, total_amount, min_amount, max_amount)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, category,
+               COUNT(*), SUM(amount), MIN(amount), MAX(amount)
+        FROM expenses
+        GROUP BY 1, 2;
+        """
+
+        cur.execute(backfill_rollups_query)
         conn.commit()
         print("Database setup completed successfully!")
 
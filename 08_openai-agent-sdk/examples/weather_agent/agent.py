@@ -2,7 +2,7 @@ from openai import AsyncOpenAI
 from agents import Agent, OpenAIChatCompletionsModel, Runner, function_tool
 import os
 from dotenv import load_dotenv
-import requests
+from http_cache import CachedHttpClient, TTLCache
 
 load_dotenv()
 
@@ -10,6 +10,12 @@ GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 OPEN_CAGE_API_KEY = os.getenv('OPEN_CAGE_API_KEY')
 OPEN_WEATHER_API_KEY = os.getenv('OPEN_WEATHER_API_KEY')
 
+# City coordinates hardly ever change, forecasts do
+GEOCODE_TTL = 30 * 24 * 3600
+FORECAST_TTL = 10 * 60
+
+http = CachedHttpClient(TTLCache("weather_cache.db"))
+
 client = AsyncOpenAI(
     api_key=GEMINI_API_KEY,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
@@ -74,11 +80,17 @@ def get_coordinates(city_name: str):
     """
     
     print("Getting coordinates for:", city_name)
-    url = f"https://api.opencagedata.com/geocode/v1/json?q={city_name}&key={OPEN_CAGE_API_KEY}"
-    response = requests.get(url)
+    status_code, data = http.get_json(
+        "https://api.opencagedata.com/geocode/v1/json",
+        params={"q": city_name, "key": OPEN_CAGE_API_KEY},
+        cache_key="geocode:" + " ".join(city_name.lower().split()),
+        ttl=GEOCODE_TTL,
+        # A city that was not found (e.g. a typo) is not remembered for 30 days
+        cache_if=lambda data: bool(data.get("results")),
+    )
     
-    if response.status_code == 200:
-        results = response.json().get("results", [])
+    if status_code == 200:
+        results = data.get("results", [])
         if results:
             latitude = results[0]["geometry"]["lat"]
             longitude = results[0]["geometry"]["lng"]
@@ -86,7 +98,7 @@ def get_coordinates(city_name: str):
         else:
             return {"error": "No results found for the provided city."}
     else:
-        return {"error": f"Request failed with status code {response.status_code}"}
+        return {"error": f"Request failed with status code {status_code}"}
 
 
 @function_tool
@@ -202,13 +214,23 @@ def get_weather(latitude: str, longitude: str):
     """
 
     print("Getting weather for:", latitude, longitude)
+    # Nearby coordinates (about 1 km apart) share one cached forecast
+    try:
+        lat, lon = round(float(latitude), 2), round(float(longitude), 2)
+    except ValueError:
+        return {"error": "Latitude and longitude must be numbers."}
     # Calling the weather API with the provided latitude and longitude
-    response = requests.get(f"https://api.openweathermap.org/data/3.0/onecall?lat={latitude}&lon={longitude}&exclude=current&appid={OPEN_WEATHER_API_KEY}&units=metric")
+    status_code, data = http.get_json(
+        "https://api.openweathermap.org/data/3.0/onecall",
+        params={"lat": lat, "lon": lon, "exclude": "current", "appid": OPEN_WEATHER_API_KEY, "units": "metric"},
+        cache_key=f"forecast:{lat:.2f},{lon:.2f}",
+        ttl=FORECAST_TTL,
+    )
 
-    if response.status_code == 200:
-        return response.json()  # Return weather data if the call succeeds
+    if status_code == 200:
+        return data  # Return weather data if the call succeeds
     else:
-        return {"error": f"Unable to fetch weather data. Error code: {response.status_code}"}
+        return {"error": f"Unable to fetch weather data. Error code: {status_code}"}
 
 agent = Agent(
     name="Assistant",
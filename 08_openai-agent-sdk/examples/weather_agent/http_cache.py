@@ -0,0 +1,107 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class TTLCache:
+    """Key/value cache with per-entry expiry, kept in memory and in SQLite
+    so it is still warm after a restart.
+
+    Only the memory_size most recently used entries are kept in memory, and
+    expired rows are purged from SQLite every purge_interval seconds."""
+
+    def __init__(self, path="weather_cache.db", memory_size=1024, purge_interval=3600):
+        self.memory = OrderedDict()
+        self.memory_size = memory_size
+        self.purge_interval = purge_interval
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self.next_purge = 0
+        self.purge(time.time())
+        self.hits = 0
+        self.misses = 0
+
+    def purge(self, now):
+        with self.conn:
+            self.conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        self.next_purge = now + self.purge_interval
+
+    def remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is None:
+                row = self.conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (json.loads(row[0]), row[1])
+            if entry is not None and entry[1] > now:
+                self.remember(key, entry)
+                self.hits += 1
+                return entry[0]
+            # Expired entries are not kept in memory
+            self.memory.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self.lock:
+            self.remember(key, (value, now + ttl))
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now + ttl),
+                )
+            if now >= self.next_purge:
+                self.purge(now)
+
+
+class CachedHttpClient:
+    """requests.Session with keep-alive, retries and a TTL cache for JSON GETs."""
+
+    def __init__(self, cache, timeout=10):
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        # raise_on_status=False: after the last retry return the error response
+        # (its status code is reported to the agent) instead of raising RetryError
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_json(self, url, params, cache_key, ttl, cache_if=None):
+        """Return (status_code, json). Only successful responses are cached,
+        and only if cache_if(json) is true when cache_if is given."""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return 200, cached
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            return response.status_code, None
+        data = response.json()
+        if cache_if is None or cache_if(data):
+            self.cache.set(cache_key, data, ttl)
+        return 200, data
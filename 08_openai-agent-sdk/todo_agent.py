@@ -3,6 +3,7 @@ from agents import Agent, OpenAIChatCompletionsModel, Runner, Tool
 import os
 from dotenv import load_dotenv
 import sqlite3
+import threading
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -15,97 +16,111 @@ client = AsyncOpenAI(
 )
 
 # Database setup
-def init_db():
-    conn = sqlite3.connect('todos.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS todos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            status TEXT DEFAULT 'pending',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+class TodoStore:
+    """SQLite todo store that keeps one open connection per thread."""
+
+    COLUMNS = "id, title, description, status, created_at, completed_at"
+
+    def __init__(self, path: str = 'todos.db'):
+        self.path = path
+        self.local = threading.local()
+        self.init_db()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers and a writer work at the same time
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+        return conn
+
+    def init_db(self):
+        conn = self.connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS todos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                status TEXT DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_todos_status ON todos (status, id)')
+        conn.commit()
+
+    def add(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        conn = self.connection()
+        with conn:
+            rows = [
+                conn.execute(
+                    f'INSERT INTO todos (title, description) VALUES (?, ?) RETURNING {self.COLUMNS}',
+                    (item["title"], item.get("description", "")),
+                ).fetchone()
+                for item in items
+            ]
+        return [dict(row) for row in rows]
+
+    def list(self, status: str = None, limit: int = 50, after_id: int = 0) -> List[Dict[str, Any]]:
+        # Keyset pagination: pass the last id of the previous page as after_id
+        query = f'SELECT {self.COLUMNS} FROM todos WHERE id > ?'
+        params = [after_id]
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        query += ' ORDER BY id LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.connection().execute(query, params)]
+
+    def complete(self, todo_ids: List[int]) -> List[Dict[str, Any]]:
+        conn = self.connection()
+        now = datetime.now().isoformat()
+        placeholders = ", ".join("?" for _ in todo_ids)
+        with conn:
+            rows = conn.execute(
+                f'UPDATE todos SET status = ?, completed_at = ? WHERE id IN ({placeholders}) '
+                f'RETURNING {self.COLUMNS}',
+                ('completed', now, *todo_ids),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, todo_id: int) -> bool:
+        conn = self.connection()
+        with conn:
+            cursor = conn.execute('DELETE FROM todos WHERE id = ?', (todo_id,))
+        return cursor.rowcount > 0
+
+
+store = TodoStore()
 
 # Tool implementations
 def add_todo(title: str, description: str = "") -> Dict[str, Any]:
     """Add a new todo item to the database."""
-    conn = sqlite3.connect('todos.db')
-    c = conn.cursor()
-    c.execute(
-        'INSERT INTO todos (title, description) VALUES (?, ?)',
-        (title, description)
-    )
-    conn.commit()
-    todo_id = c.lastrowid
-    conn.close()
-    return {"id": todo_id, "title": title, "description": description, "status": "pending"}
-
-def list_todos(status: str = None) -> List[Dict[str, Any]]:
-    """List all todos, optionally filtered by status."""
-    conn = sqlite3.connect('todos.db')
-    c = conn.cursor()
-    
-    if status:
-        c.execute('SELECT * FROM todos WHERE status = ?', (status,))
-    else:
-        c.execute('SELECT * FROM todos')
-    
-    todos = []
-    for row in c.fetchall():
-        todos.append({
-            "id": row[0],
-            "title": row[1],
-            "description": row[2],
-            "status": row[3],
-            "created_at": row[4],
-            "completed_at": row[5]
-        })
-    conn.close()
-    return todos
+    return store.add([{"title": title, "description": description}])[0]
+
+def add_todos(todos: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Add several todo items in one transaction."""
+    return store.add(todos)
+
+def list_todos(status: str = None, limit: int = 50, after_id: int = 0) -> List[Dict[str, Any]]:
+    """List todos page by page, optionally filtered by status."""
+    return store.list(status, limit, after_id)
 
 def complete_todo(todo_id: int) -> Dict[str, Any]:
     """Mark a todo as completed."""
-    conn = sqlite3.connect('todos.db')
-    c = conn.cursor()
-    now = datetime.now().isoformat()
-    c.execute(
-        'UPDATE todos SET status = ?, completed_at = ? WHERE id = ?',
-        ('completed', now, todo_id)
-    )
-    conn.commit()
-    
-    c.execute('SELECT * FROM todos WHERE id = ?', (todo_id,))
-    todo = c.fetchone()
-    conn.close()
-    
-    if todo:
-        return {
-            "id": todo[0],
-            "title": todo[1],
-            "description": todo[2],
-            "status": "completed",
-            "created_at": todo[4],
-            "completed_at": now
-        }
-    return None
+    todos = store.complete([todo_id])
+    return todos[0] if todos else None
+
+def complete_todos(todo_ids: List[int]) -> List[Dict[str, Any]]:
+    """Mark several todos as completed."""
+    return store.complete(todo_ids)
 
 def delete_todo(todo_id: int) -> bool:
     """Delete a todo item."""
-    conn = sqlite3.connect('todos.db')
-    c = conn.cursor()
-    c.execute('DELETE FROM todos WHERE id = ?', (todo_id,))
-    conn.commit()
-    success = c.rowcount > 0
-    conn.close()
-    return success
-
-# Initialize database
-init_db()
+    return store.delete(todo_id)
 
 # Create tools
 tools = [
@@ -118,12 +133,33 @@ tools = [
             "description": {"type": "string", "description": "Optional description of the todo item"}
         }
     ),
+    Tool(
+        name="add_todos",
+        description="Add several todo items at once",
+        function=add_todos,
+        parameters={
+            "todos": {
+                "type": "array",
+                "description": "Todo items, each with a title and optional description",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"}
+                    },
+                    "required": ["title"]
+                }
+            }
+        }
+    ),
     Tool(
         name="list_todos",
-        description="List all todos, optionally filtered by status (pending/completed)",
+        description="List todos page by page, optionally filtered by status (pending/completed)",
         function=list_todos,
         parameters={
-            "status": {"type": "string", "description": "Optional status filter (pending/completed)"}
+            "status": {"type": "string", "description": "Optional status filter (pending/completed)"},
+            "limit": {"type": "integer", "description": "Maximum number of todos to return (default 50)"},
+            "after_id": {"type": "integer", "description": "Return todos with an id greater than this (the last id of the previous page)"}
         }
     ),
     Tool(
@@ -134,6 +170,14 @@ tools = [
             "todo_id": {"type": "integer", "description": "The ID of the todo item to complete"}
         }
     ),
+    Tool(
+        name="complete_todos",
+        description="Mark several todo items as completed",
+        function=complete_todos,
+        parameters={
+            "todo_ids": {"type": "array", "items": {"type": "integer"}, "description": "The IDs of the todo items to complete"}
+        }
+    ),
     Tool(
         name="delete_todo",
         description="Delete a todo item",
@@ -148,9 +192,9 @@ tools = [
 agent = Agent(
     name="TodoAssistant",
     instructions="""You are a helpful Todo management assistant. You can:
-    1. Add new todo items
-    2. List all todos or filter by status
-    3. Mark todos as completed
+    1. Add new todo items (one or many at once)
+    2. List todos page by page or filter by status
+    3. Mark one or many todos as completed
     4. Delete todos
     Always be clear and concise in your responses. When listing todos, format them nicely.""",
     model=OpenAIChatCompletionsModel(
@@ -0,0 +1,155 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TodoLogStore:
+    """Todo storage for agent tools, safe to share between processes.
+
+    Every change is appended as one JSON line to the log file, so adding a
+    todo does not rewrite the whole file. An in-memory index (id -> todo) is
+    kept up to date by reading only the lines other processes appended since
+    the last call. When the log holds many old versions it is compacted into
+    a new file that atomically replaces the old one. Its first line records
+    the next free id, so ids of deleted todos are never handed out again.
+    """
+
+    def __init__(self, path: str, legacy_json_path: Optional[str] = None, compact_min_lines: int = 1000):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.legacy_json_path = legacy_json_path
+        self.compact_min_lines = compact_min_lines
+        self.todos: Dict[int, Dict[str, Any]] = {}
+        self.next_id = 1
+        self.offset = 0
+        self.file_id = None
+        self.lines = 0
+
+    @contextmanager
+    def locked(self):
+        # Lock a separate file so the log itself can be replaced by compaction
+        with open(self.lock_path, "a+") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                self.refresh()
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def refresh(self):
+        if not os.path.exists(self.path):
+            self.import_legacy_json()
+            if not os.path.exists(self.path):
+                return
+
+        stat = os.stat(self.path)
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:
+            # The log was compacted by another process, read it from the start
+            self.todos, self.offset, self.lines, self.file_id = {}, 0, 0, file_id
+            self.next_id = 1
+        if stat.st_size == self.offset:
+            return
+
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            data = file.read()
+        # Stop at the last complete line
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self.apply(json.loads(line))
+                self.lines += 1
+        self.offset += end
+
+    def apply(self, record: Dict[str, Any]):
+        if "id" not in record:
+            # {"next_id": n} header written by compaction
+            self.next_id = max(self.next_id, record.get("next_id", 1))
+            return
+        self.next_id = max(self.next_id, record["id"] + 1)
+        if record.get("deleted"):
+            self.todos.pop(record["id"], None)
+        else:
+            self.todos[record["id"]] = record
+
+    def import_legacy_json(self):
+        # Start the log from the old todos.json file, if there is one
+        if self.legacy_json_path and os.path.exists(self.legacy_json_path):
+            with open(self.legacy_json_path) as file:
+                todos = json.load(file)
+            self.write_atomic(todos, max((todo["id"] for todo in todos), default=0) + 1)
+
+    def append(self, record: Dict[str, Any]):
+        # Binary mode: self.offset counts bytes, and text mode would write
+        # "\r\n" on Windows
+        line = (json.dumps(record) + "\n").encode()
+        with open(self.path, "ab") as file:
+            if file.tell() > self.offset:
+                # A writer that crashed left half a line after the last
+                # complete one, drop it so this record starts on its own line
+                file.truncate(self.offset)
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+        self.apply(record)
+        self.offset += len(line)
+        self.lines += 1
+        self.maybe_compact()
+
+    def write_atomic(self, todos: List[Dict[str, Any]], next_id: int):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", newline="") as file:
+            file.write(json.dumps({"next_id": next_id}) + "\n")
+            for todo in todos:
+                file.write(json.dumps(todo) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def maybe_compact(self):
+        if self.lines >= self.compact_min_lines and self.lines > 2 * len(self.todos):
+            self.write_atomic(list(self.todos.values()), self.next_id)
+            self.file_id = None
+            self.refresh()
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self.locked():
+            return list(self.todos.values())
+
+    def add(self, todo: Dict[str, Any]) -> Dict[str, Any]:
+        with self.locked():
+            # The id is chosen while holding the lock, so it is unique
+            todo = {"id": self.next_id, **todo}
+            self.append(todo)
+            return todo
+
+    def update(self, todo_id: int, **changes) -> Optional[Dict[str, Any]]:
+        with self.locked():
+            if todo_id not in self.todos:
+                return None
+            todo = {**self.todos[todo_id], **changes}
+            self.append(todo)
+            return todo
+
+    def delete(self, todo_id: int) -> bool:
+        with self.locked():
+            if todo_id not in self.todos:
+                return False
+            self.append({"id": todo_id, "deleted": True})
+            return True
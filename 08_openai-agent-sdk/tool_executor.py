@@ -0,0 +1,86 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from agents import function_tool
+
+# Sync tools run here instead of on the event loop that Runner.run uses, so
+# several tool calls from one model turn (and other sessions) run at the same time
+TOOL_THREADS = int(os.getenv("TOOL_THREADS", "8"))
+executor = ThreadPoolExecutor(max_workers=TOOL_THREADS, thread_name_prefix="tool")
+
+# Per tool: calls, errors, timeouts, total and max latency in ms
+tool_stats = {}
+
+
+def record(name, elapsed_ms, error=False, timeout=False):
+    stats = tool_stats.setdefault(
+        name, {"calls": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+    )
+    stats["calls"] += 1
+    stats["errors"] += error
+    stats["timeouts"] += timeout
+    stats["total_ms"] += elapsed_ms
+    stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def print_tool_stats():
+    for name, stats in tool_stats.items():
+        average = stats["total_ms"] / stats["calls"]
+        print(f"{name:25s} calls={stats['calls']:4d} avg={average:8.1f}ms max={stats['max_ms']:8.1f}ms "
+              f"errors={stats['errors']} timeouts={stats['timeouts']}")
+
+
+def threaded_tool(func=None, *, timeout=30.0, **function_tool_kwargs):
+    """Use instead of @function_tool for tools that do blocking I/O.
+
+    Sync functions are run in a bounded thread pool and their latency is
+    recorded in tool_stats. Async functions only get the timing. Extra keyword
+    arguments are passed on to function_tool.
+
+    timeout only stops waiting: a thread cannot be killed, so a timed-out sync
+    call keeps running (and keeps its pool thread busy) until it returns, and
+    may still complete. Use timeout=None for tools with side effects (writes,
+    sending mail), so the model is never told such a call failed when it may
+    have gone through.
+    """
+
+    def decorate(f):
+        name = function_tool_kwargs.get("name_override") or f.__name__
+
+        # functools.wraps keeps the signature and docstring, so the SDK builds
+        # the same JSON schema as for the original function
+        @functools.wraps(f)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = timed_out = False
+            try:
+                if inspect.iscoroutinefunction(f):
+                    call = f(*args, **kwargs)
+                else:
+                    # Copy the context so tracing spans still work in the thread
+                    context = contextvars.copy_context()
+                    call = asyncio.get_running_loop().run_in_executor(
+                        executor, functools.partial(context.run, f, *args, **kwargs)
+                    )
+                if timeout is None:
+                    return await call
+                return await asyncio.wait_for(call, timeout)
+            except asyncio.TimeoutError:
+                error = timed_out = True
+                raise TimeoutError(
+                    f"Tool {name} did not answer within {timeout}s. It may still complete in "
+                    f"the background, check its result before calling it again"
+                )
+            except Exception:
+                error = True
+                raise
+            finally:
+                record(name, (time.perf_counter() - start) * 1000, error, timed_out)
+
+        return function_tool(wrapper, **function_tool_kwargs)
+
+    return decorate(func) if func is not None else decorate
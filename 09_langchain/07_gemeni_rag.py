@@ -1,10 +1,13 @@
 from langchain_community.document_loaders import TextLoader
-from langchain.indexes import VectorstoreIndexCreator
+from langchain.indexes.vectorstore import VectorStoreIndexWrapper
 from langchain.text_splitter import CharacterTextSplitter
 from langchain_google_genai import GoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langchain.memory import ConversationBufferWindowMemory
 import os
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbeddings
+from embedding_pipeline import EmbeddingPipeline, iter_chunks
+from faiss_index import FaissIndexStore
 load_dotenv()
 
 llm = GoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=os.getenv("GOOGLE_API_KEY"))
@@ -20,18 +23,17 @@ except Exception as e:
 if loader is None:
     raise ValueError("Failed to load the file.")
 
-# Create embeddings
-embedding = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+# Create embeddings (cached, so a restart does not embed the same chunks again)
+embedding = CachedEmbeddings(GoogleGenerativeAIEmbeddings(model="models/embedding-001"))
 
 # Use a smaller chunk size to manage token limits
 text_splitter = CharacterTextSplitter(chunk_size=500, chunk_overlap=100)
 
-# Create the index with the specified embedding model and text splitter
-index_creator = VectorstoreIndexCreator(
-    embedding=embedding,
-    text_splitter=text_splitter
-)
-store = index_creator.from_loaders([loader])
+# Stream the chunks through a concurrent, rate limited embedding pipeline
+# into a saved FAISS index (only new or changed chunks are embedded)
+index_store = FaissIndexStore("faiss_index/hotel_gemini_500", embedding)
+index_store.sync(iter_chunks([loader], text_splitter), pipeline=EmbeddingPipeline(embedding, max_workers=4))
+store = VectorStoreIndexWrapper(vectorstore=index_store.vectorstore)
 
 # Query the index with the LLM
 while True:
@@ -3,7 +3,6 @@ from langchain.agents import create_tool_calling_agent
 from langchain_google_genai import ChatGoogleGenerativeAI,GoogleGenerativeAIEmbeddings
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.document_loaders import WebBaseLoader
-from langchain_community.vectorstores import FAISS
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.tools.retriever import create_retriever_tool
 from langchain_community.chat_message_histories import ChatMessageHistory
@@ -12,6 +11,10 @@ from langchain import hub
 from langchain.tools import tool
 import os
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbeddings
+from embedding_pipeline import EmbeddingPipeline, iter_chunks
+from faiss_index import FaissIndexStore
+from hybrid_retriever import HybridRetriever
 load_dotenv()
 
 # Initialize the LLM with GoogleGenerativeAI
@@ -21,13 +24,18 @@ llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash",
 search = TavilySearchResults(tavily_api_key=os.getenv("TAVILY_API_KEY"))
 
 loader = WebBaseLoader("https://www.techloset.com/")
-docs = loader.load()
-documents = RecursiveCharacterTextSplitter(
+text_splitter = RecursiveCharacterTextSplitter(
     chunk_size=1000, chunk_overlap=200
-).split_documents(docs)
-vector = FAISS.from_documents(documents, GoogleGenerativeAIEmbeddings(model="models/embedding-001"))
-
-retriever = vector.as_retriever()
+)
+# Cached embeddings: unchanged pages and repeated questions are not embedded again
+embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(model="models/embedding-001"))
+# Chunks are embedded concurrently and written to the saved index as they arrive
+index_store = FaissIndexStore("faiss_index/techloset", embeddings)
+index_store.sync(iter_chunks([loader], text_splitter), pipeline=EmbeddingPipeline(embeddings, max_workers=4))
+vector = index_store.vectorstore
+
+# BM25 + vector search fused into fewer, more relevant chunks
+retriever = HybridRetriever.from_index_store(index_store, k=3)
 
 retriever_tool = create_retriever_tool(
     retriever,
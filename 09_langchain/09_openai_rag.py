@@ -1,9 +1,12 @@
 from langchain_community.document_loaders import TextLoader
 import os
 from langchain_openai import OpenAIEmbeddings
-from langchain.indexes import VectorstoreIndexCreator
+from langchain.indexes.vectorstore import VectorStoreIndexWrapper
 from langchain_openai import OpenAI
 from langchain.text_splitter import CharacterTextSplitter
+from embedding_cache import CachedEmbeddings
+from embedding_pipeline import EmbeddingPipeline, iter_chunks
+from faiss_index import FaissIndexStore
 
 try:
     loader = TextLoader("data.txt")
@@ -11,18 +14,17 @@ try:
 except Exception as e:
     print("Error while loading file=", e)
 
-# Create embeddings
-embedding = OpenAIEmbeddings()
+# Create embeddings (cached, so a restart does not embed the same chunks again)
+embedding = CachedEmbeddings(OpenAIEmbeddings())
 
 # Use a smaller chunk size to manage token limits
 text_splitter = CharacterTextSplitter(chunk_size=500, chunk_overlap=100)
 
-# Create the index with the specified embedding model and text splitter
-index_creator = VectorstoreIndexCreator(
-    embedding=embedding,
-    text_splitter=text_splitter
-)
-index = index_creator.from_loaders([loader])
+# Stream the chunks through a concurrent, rate limited embedding pipeline
+# into a saved FAISS index (only new or changed chunks are embedded)
+index_store = FaissIndexStore("faiss_index/hotel_openai_500", embedding)
+index_store.sync(iter_chunks([loader], text_splitter), pipeline=EmbeddingPipeline(embedding, max_workers=4))
+index = VectorStoreIndexWrapper(vectorstore=index_store.vectorstore)
 
 # Specify the LLM for querying
 llm = OpenAI(temperature=0)  # Replace with the correct LLM class initialization
@@ -1,6 +1,5 @@
 
 from langchain_community.document_loaders import TextLoader
-from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import CharacterTextSplitter
 from langchain.tools.retriever import create_retriever_tool
@@ -10,6 +9,9 @@ from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
 import os
+from embedding_cache import CachedEmbeddings
+from faiss_index import FaissIndexStore
+from hybrid_retriever import HybridRetriever
 
 load_dotenv()
 
@@ -23,10 +25,15 @@ documents = loader.load()
 text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
 texts = text_splitter.split_documents(documents)
 
-embeddings = OpenAIEmbeddings()
+# Repeated questions are answered from the embedding cache
+embeddings = CachedEmbeddings(OpenAIEmbeddings())
 
-db = FAISS.from_documents(texts, embeddings)
-retriever = db.as_retriever()
+# Only chunks that are not in the saved index yet get embedded
+index_store = FaissIndexStore("faiss_index/hotel_openai", embeddings)
+index_store.sync(texts)
+db = index_store.vectorstore
+# BM25 + vector search fused into fewer, more relevant chunks
+retriever = HybridRetriever.from_index_store(index_store, k=3)
 
 
 tool = create_retriever_tool(
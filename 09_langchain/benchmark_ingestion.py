@@ -0,0 +1,148 @@
+"""Compare serial and concurrent embedding against a local fake embedding server.
+
+The fake server speaks the OpenAI /v1/embeddings API, takes a bit of time per
+request and answers 429 when it gets more than --server-rps requests per
+second, so the rate limiter and the retries are exercised without an API key.
+
+    python benchmark_ingestion.py --docs 2000 --workers 1 4 8
+"""
+import argparse
+import hashlib
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.documents import Document
+from langchain_openai import OpenAIEmbeddings
+from langchain_text_splitters import CharacterTextSplitter
+
+from embedding_pipeline import EmbeddingPipeline, iter_chunks
+from faiss_index import FaissIndexStore
+
+DIMENSIONS = 64
+WORDS = "hotel room pool breakfast spa parking checkin checkout view suite lobby gym".split()
+
+
+def fake_vector(text):
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    return [rng.uniform(-1, 1) for _ in range(DIMENSIONS)]
+
+
+def make_server(latency, rps):
+    lock = threading.Lock()
+    window = {"second": 0, "count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with lock:
+                second = int(time.monotonic())
+                if window["second"] != second:
+                    window["second"], window["count"] = second, 0
+                window["count"] += 1
+                limited = window["count"] > rps
+
+            if limited:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b'{"error": {"message": "Rate limit reached", "type": "requests"}}')
+                return
+
+            texts = body["input"]
+            time.sleep(latency + 0.0005 * len(texts))
+            data = [
+                {"object": "embedding", "index": i, "embedding": fake_vector(str(text))}
+                for i, text in enumerate(texts)
+            ]
+            payload = json.dumps({
+                "object": "list",
+                "data": data,
+                "model": body["model"],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class FakeLoader:
+    """Generates documents one at a time, like a loader reading files lazily."""
+
+    def __init__(self, count, seed=0):
+        self.count = count
+        self.seed = seed
+
+    def lazy_load(self):
+        rng = random.Random(self.seed)
+        for i in range(self.count):
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(100, 400)))
+            yield Document(page_content=text, metadata={"source": f"doc-{i}.txt"})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per request")
+    parser.add_argument("--server-rps", type=int, default=40, help="Requests per second before 429")
+    parser.add_argument("--rpm", type=int, default=3000, help="Client requests per minute limit")
+    parser.add_argument("--tpm", type=int, default=20_000_000, help="Client tokens per minute limit")
+    args = parser.parse_args()
+
+    server = make_server(args.latency, args.server_rps)
+    embeddings = OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        base_url=f"http://127.0.0.1:{server.server_port}/v1",
+        api_key="fake",
+        check_embedding_ctx_length=False,
+        max_retries=0,
+    )
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=500, chunk_overlap=50)
+
+    for workers in args.workers:
+        directory = tempfile.mkdtemp(prefix="faiss_bench_")
+        try:
+            store = FaissIndexStore(directory, embeddings)
+            pipeline = EmbeddingPipeline(
+                embeddings,
+                max_workers=workers,
+                requests_per_minute=args.rpm,
+                tokens_per_minute=args.tpm,
+                max_batch_size=64,
+            )
+            chunks = iter_chunks([FakeLoader(args.docs)], splitter)
+            store.sync(chunks, pipeline=pipeline)
+            stats = pipeline.stats
+            print(
+                f"workers={workers:2d} chunks={stats['chunks']} batches={stats['batches']} "
+                f"retries={stats['retries']} time={stats['seconds']:.2f}s "
+                f"({stats['chunks'] / max(stats['seconds'], 1e-9):.0f} chunks/s)"
+            )
+
+            # A second run over the same corpus must not embed anything
+            again = EmbeddingPipeline(embeddings, max_workers=workers)
+            store.sync(iter_chunks([FakeLoader(args.docs)], splitter), pipeline=again)
+            assert again.stats["chunks"] == 0
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Cache for embedding calls, shared by all the RAG scripts.
+
+CachedEmbeddings wraps any LangChain embeddings object. Vectors are stored
+under (model, kind, sha256 of the text), first in a small in-process LRU and
+then in SQLite, so the same chunk or the same question is only sent to the
+embedding API once, even across restarts and scripts.
+
+    embeddings = CachedEmbeddings(OpenAIEmbeddings())
+    print(embeddings.stats())
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.db")
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings with a memory LRU and an SQLite store in front of the real API."""
+
+    def __init__(self, embeddings, path=CACHE_PATH, memory_size=4096, model=None):
+        self.embeddings = embeddings
+        # Same attribute the wrapped classes have, so FaissIndexStore sees the real model
+        self.model = model or getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.memory_size = memory_size
+        self.memory = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0}
+
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self.conn.commit()
+
+    def key(self, kind, text):
+        # Documents and queries can get different vectors (Gemini uses a task type)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model}:{kind}:{digest}"
+
+    def remember(self, key, vector):
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def read_disk(self, keys):
+        found = {}
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def lookup(self, kind, texts, embed):
+        keys = [self.key(kind, text) for text in texts]
+        results = {}
+        waiting = {}
+        missing = {}
+
+        with self.lock:
+            for key, text in zip(keys, texts):
+                if key in results or key in waiting or key in missing:
+                    # Same text twice in one batch, embedded once
+                    continue
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    results[key] = self.memory[key]
+                    self.counts["memory_hits"] += 1
+                elif key in self.inflight:
+                    # Another thread is embedding this text right now
+                    waiting[key] = self.inflight[key]
+                    self.counts["coalesced"] += 1
+                else:
+                    missing[key] = text
+
+            if missing:
+                for key, vector in self.read_disk(list(missing)).items():
+                    del missing[key]
+                    results[key] = vector
+                    self.remember(key, vector)
+                    self.counts["disk_hits"] += 1
+
+            futures = {key: Future() for key in missing}
+            self.inflight.update(futures)
+            self.counts["misses"] += len(missing)
+
+        if missing:
+            error = None
+            try:
+                vectors = [list(vector) for vector in embed(list(missing.values()))]
+                with self.lock:
+                    for key, vector in zip(missing, vectors):
+                        results[key] = vector
+                        self.remember(key, vector)
+                    try:
+                        self.conn.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                            [
+                                (key, np.asarray(vector, dtype=np.float32).tobytes())
+                                for key, vector in zip(missing, vectors)
+                            ],
+                        )
+                        self.conn.commit()
+                    except sqlite3.Error as e:
+                        # The vectors are still good, they are just not on disk
+                        self.conn.rollback()
+                        print(f"Could not write {len(vectors)} embeddings to the cache: {e}")
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                # Always wake up the threads waiting for these texts
+                with self.lock:
+                    for key, future in futures.items():
+                        del self.inflight[key]
+                        if key in results:
+                            future.set_result(results[key])
+                        else:
+                            future.set_exception(error or RuntimeError("No embedding returned"))
+
+        for key, future in waiting.items():
+            results[key] = future.result()
+
+        return [results[key] for key in keys]
+
+    def embed_documents(self, texts):
+        return self.lookup("document", texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text):
+        return self.lookup("query", [text], lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"] + counts["coalesced"]
+        hits = lookups - counts["misses"]
+        counts["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return counts
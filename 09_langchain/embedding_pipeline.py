@@ -0,0 +1,156 @@
+"""Batched, concurrent embedding of document chunks.
+
+Chunks are streamed from the loaders and split one document at a time, grouped
+into batches with a token limit, and sent to the embedding API from a few
+threads. Two token buckets keep the calls under the provider's requests and
+tokens per minute limits, and failed batches are retried with backoff. Every
+finished batch is handed to a callback right away, so vectors are written to
+the index while the rest of the corpus is still being embedded.
+
+    pipeline = EmbeddingPipeline(embeddings, max_workers=4)
+    index_store.sync(iter_chunks([TextLoader("data.txt")], splitter), pipeline=pipeline)
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Provider limits, defaults are below the OpenAI tier 1 limits for embeddings
+REQUESTS_PER_MINUTE = int(os.getenv("EMBEDDING_RPM", "3000"))
+TOKENS_PER_MINUTE = int(os.getenv("EMBEDDING_TPM", "1000000"))
+
+
+def count_tokens(text):
+    # Close enough for English text, and no tokenizer download needed
+    return len(text) // 4 + 1
+
+
+def iter_chunks(loaders, splitter):
+    """Yield chunks without loading the whole corpus into memory first."""
+    for loader in loaders:
+        for doc in loader.lazy_load():
+            yield from splitter.split_documents([doc])
+
+
+def token_batches(chunks, max_tokens=8000, max_size=256):
+    """Group chunks into batches of at most max_tokens tokens and max_size chunks."""
+    batch, batch_tokens = [], 0
+    for chunk in chunks:
+        tokens = count_tokens(chunk.page_content)
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_size):
+            yield batch, batch_tokens
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += tokens
+    if batch:
+        yield batch, batch_tokens
+
+
+class TokenBucket:
+    """Allows `rate` units per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.available = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        # A batch bigger than the bucket would wait forever, so cap it
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                delay = (amount - self.available) / self.rate
+            time.sleep(delay)
+
+
+def retry_after(error):
+    # OpenAI errors carry the HTTP response, use its Retry-After header if set
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class EmbeddingPipeline:
+    def __init__(
+        self,
+        embeddings,
+        max_workers=4,
+        requests_per_minute=REQUESTS_PER_MINUTE,
+        tokens_per_minute=TOKENS_PER_MINUTE,
+        max_batch_tokens=8000,
+        max_batch_size=256,
+        retries=5,
+    ):
+        self.embeddings = embeddings
+        self.max_workers = max_workers
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.retries = retries
+        self.requests = TokenBucket(requests_per_minute / 60, max(1, requests_per_minute // 60))
+        self.tokens = TokenBucket(tokens_per_minute / 60, max(max_batch_tokens, tokens_per_minute // 60))
+        self.stats = {"batches": 0, "chunks": 0, "tokens": 0, "retries": 0, "seconds": 0.0}
+
+    def embed_batch(self, batch, batch_tokens):
+        # Returns the vectors and the number of retries, which run() adds to
+        # the stats in the calling thread
+        texts = [chunk.page_content for chunk in batch]
+        for attempt in range(self.retries + 1):
+            self.requests.acquire()
+            self.tokens.acquire(batch_tokens)
+            try:
+                return self.embeddings.embed_documents(texts), attempt
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = retry_after(e) or min(60, 2 ** attempt) + random.random()
+                print(f"Embedding batch failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def run(self, chunks, on_batch):
+        """Embed chunks and call on_batch(chunks, vectors) for every finished batch.
+
+        on_batch runs in the calling thread, so it can write to an index that
+        is not thread safe. Batches may finish out of order. Returns the number
+        of chunks embedded by this call; self.stats adds up over all calls.
+        """
+        start = time.perf_counter()
+        embedded = 0
+        batches = token_batches(chunks, self.max_batch_tokens, self.max_batch_size)
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="embed") as pool:
+            while True:
+                # Keep a few batches queued per worker, but never the whole corpus
+                for batch, batch_tokens in batches:
+                    future = pool.submit(self.embed_batch, batch, batch_tokens)
+                    pending[future] = (batch, batch_tokens)
+                    if len(pending) >= self.max_workers * 2:
+                        break
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch, batch_tokens = pending.pop(future)
+                    vectors, retries = future.result()
+                    on_batch(batch, vectors)
+                    embedded += len(batch)
+                    self.stats["retries"] += retries
+                    self.stats["batches"] += 1
+                    self.stats["chunks"] += len(batch)
+                    self.stats["tokens"] += batch_tokens
+
+        self.stats["seconds"] = round(self.stats["seconds"] + time.perf_counter() - start, 2)
+        return embedded
@@ -0,0 +1,237 @@
+"""Persistent FAISS index for the RAG scripts.
+
+FAISS.from_documents embeds the whole corpus every time a script starts. This
+module keeps the vectors in a FAISS file (memory-mapped when it is loaded) and
+the chunk texts in SQLite, so a restart only reads them back from disk. sync()
+compares chunk ids (a hash of source + text) with what is already stored and
+only embeds chunks that are new or changed.
+
+    store = FaissIndexStore("faiss_index/hotel", embeddings)
+    store.sync(texts)
+    retriever = store.vectorstore.as_retriever()
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import faiss
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from embedding_pipeline import EmbeddingPipeline
+
+
+def chunk_id(doc):
+    # Same source and same text gives the same id, any edit gives a new one
+    source = str(doc.metadata.get("source", ""))
+    return hashlib.sha256(f"{source}\0{doc.page_content}".encode("utf-8")).hexdigest()[:32]
+
+
+def embedding_model_name(embeddings):
+    # OpenAIEmbeddings and GoogleGenerativeAIEmbeddings both have a model field
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+
+class SQLiteDocstore(Docstore, AddableMixin):
+    """Chunk texts and metadata, read from SQLite only when a search returns them."""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def add(self, texts):
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, text, metadata) VALUES (?, ?, ?)",
+                [(id_, doc.page_content, json.dumps(doc.metadata)) for id_, doc in texts.items()],
+            )
+
+    def delete(self, ids):
+        with self.lock:
+            self.conn.executemany("DELETE FROM chunks WHERE id = ?", [(id_,) for id_ in ids])
+
+    def search(self, search):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT text, metadata FROM chunks WHERE id = ?", (search,)
+            ).fetchone()
+        if row is None:
+            return f"ID {search} not found."
+        return Document(id=search, page_content=row[0], metadata=json.loads(row[1]))
+
+
+class FaissIndexStore:
+    """A FAISS vector store that is saved to a directory and updated in place."""
+
+    def __init__(self, directory, embeddings, batch_size=128):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+
+        self.conn = sqlite3.connect(os.path.join(directory, "docstore.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                position INTEGER
+            )"""
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+        self.docstore = SQLiteDocstore(self.conn, self.lock)
+        self.vectorstore = self.load()
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def reset(self, reason):
+        print(f"{reason}, rebuilding the index in {self.directory}")
+        self.conn.execute("DELETE FROM chunks")
+        self.conn.execute("DELETE FROM meta")
+        self.conn.commit()
+
+    def load(self):
+        start = time.perf_counter()
+        index_file = self.get_meta("index_file")
+        if index_file is None:
+            return None
+
+        model = embedding_model_name(self.embeddings)
+        if self.get_meta("embedding_model") != model:
+            self.reset(f"Embedding model changed to {model}")
+            return None
+
+        path = os.path.join(self.directory, index_file)
+        if not os.path.exists(path):
+            self.reset(f"{path} is missing")
+            return None
+
+        # Memory-map the vectors instead of reading them all into RAM
+        index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+        rows = self.conn.execute(
+            "SELECT position, id FROM chunks WHERE position IS NOT NULL ORDER BY position"
+        ).fetchall()
+        if index.ntotal != len(rows):
+            self.reset(f"{path} has {index.ntotal} vectors but the docstore has {len(rows)} chunks")
+            return None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Loaded {index.ntotal} vectors from {self.directory} in {elapsed_ms:.1f}ms")
+        return FAISS(self.embeddings, index, self.docstore, dict(rows))
+
+    def documents(self):
+        """All stored chunks in index order, used to build the BM25 index."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, text, metadata FROM chunks WHERE position IS NOT NULL ORDER BY position"
+            ).fetchall()
+        return [Document(id=id_, page_content=text, metadata=json.loads(metadata)) for id_, text, metadata in rows]
+
+    def add_vectors(self, ids, docs, vectors):
+        if self.vectorstore is None:
+            # Same index type FAISS.from_documents uses
+            index = faiss.IndexFlatL2(len(vectors[0]))
+            self.vectorstore = FAISS(self.embeddings, index, self.docstore, {})
+        self.vectorstore.add_embeddings(
+            [(doc.page_content, vector) for doc, vector in zip(docs, vectors)],
+            metadatas=[doc.metadata for doc in docs],
+            ids=ids,
+        )
+
+    def sync(self, documents, prune=True, pipeline=None, save_every=10000):
+        """Embed chunks that are not in the index yet.
+
+        documents can be a list or a generator (see embedding_pipeline.iter_chunks).
+        New chunks are embedded by pipeline, concurrently and rate limited, and
+        the index is saved every save_every chunks so an interrupted run picks
+        up where it stopped. With prune=True, chunks that are stored but no
+        longer in documents are deleted, so documents should be the whole
+        corpus. Returns the number of added and removed chunks. Raises
+        ValueError if the index ends up empty, since FAISS cannot search it.
+        """
+        if pipeline is None:
+            pipeline = EmbeddingPipeline(self.embeddings, max_batch_size=self.batch_size)
+
+        with self.lock:
+            stored = {row[0] for row in self.conn.execute("SELECT id FROM chunks")}
+            seen = set()
+
+            def new_chunks():
+                for doc in documents:
+                    id_ = chunk_id(doc)
+                    if id_ in seen:
+                        continue
+                    seen.add(id_)
+                    if id_ not in stored:
+                        yield doc
+
+            unsaved = 0
+
+            def on_batch(docs, vectors):
+                nonlocal unsaved
+                self.add_vectors([chunk_id(doc) for doc in docs], docs, vectors)
+                unsaved += len(docs)
+                if unsaved >= save_every:
+                    self.save()
+                    unsaved = 0
+
+            added = pipeline.run(new_chunks(), on_batch)
+            stale_ids = list(stored - seen) if prune else []
+
+            if not added and not stale_ids:
+                self.check_not_empty()
+                print(f"Index is up to date ({len(stored)} chunks)")
+                return 0, 0
+
+            if stale_ids:
+                self.vectorstore.delete(stale_ids)
+
+            self.save()
+            self.check_not_empty()
+            print(f"Embedded {added} new chunks, removed {len(stale_ids)} old chunks")
+            return added, len(stale_ids)
+
+    def check_not_empty(self):
+        if self.vectorstore is None:
+            raise ValueError(f"No documents to index in {self.directory}, check that the loaders find any files")
+
+    def save(self):
+        with self.lock:
+            if self.vectorstore is None or self.vectorstore.index.ntotal == 0:
+                self.reset("Index is empty")
+                self.vectorstore = None
+            else:
+                # Write a new file and switch to it in the same transaction that
+                # stores the positions, so a crash never leaves them out of step
+                index_file = f"index-{uuid.uuid4().hex[:12]}.faiss"
+                faiss.write_index(self.vectorstore.index, os.path.join(self.directory, index_file))
+                self.conn.executemany(
+                    "UPDATE chunks SET position = ? WHERE id = ?",
+                    list(self.vectorstore.index_to_docstore_id.items()),
+                )
+                self.set_meta("index_file", index_file)
+                self.set_meta("embedding_model", embedding_model_name(self.embeddings))
+                self.conn.commit()
+
+            current = self.get_meta("index_file")
+            for name in os.listdir(self.directory):
+                if name.startswith("index-") and name.endswith(".faiss") and name != current:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        # Still memory-mapped on Windows, removed on the next save
+                        pass
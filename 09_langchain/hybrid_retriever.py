@@ -0,0 +1,145 @@
+"""Hybrid keyword + vector retriever for the RAG agents.
+
+Vector search is good at meaning but misses exact words (room numbers, names,
+prices), BM25 is the other way round. HybridRetriever runs both, merges the two
+rankings with reciprocal rank fusion, drops chunks that mostly repeat a better
+ranked one (the splitters use overlap), and can rerank the result with a local
+cross-encoder. It is a normal LangChain retriever, so create_retriever_tool
+works with it unchanged.
+
+    retriever = HybridRetriever.from_index_store(index_store, k=3)
+"""
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Any, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids = []
+        self.lengths = []
+        self.postings = defaultdict(list)  # term -> [(doc number, term count)]
+
+        for number, doc in enumerate(documents):
+            tokens = tokenize(doc.page_content)
+            self.ids.append(doc.id)
+            self.lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                self.postings[term].append((number, count))
+
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        total = len(self.ids)
+        self.idf = {
+            term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query, k):
+        # Only documents that share a term with the query are scored
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for number, count in self.postings[term]:
+                norm = 1 - self.b + self.b * self.lengths[number] / self.average_length
+                scores[number] += idf * count * (self.k1 + 1) / (count + self.k1 * norm)
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.ids[number], score) for number, score in best]
+
+
+class CrossEncoderReranker:
+    """Scores (query, chunk) pairs with a local cross-encoder model."""
+
+    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2"):
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name)
+
+    def rerank(self, query, documents, k):
+        if not documents:
+            return documents
+        scores = self.model.predict([(query, doc.page_content) for doc in documents])
+        ranked = sorted(zip(documents, scores), key=lambda item: item[1], reverse=True)
+        return [doc for doc, _ in ranked[:k]]
+
+
+def reranker_from_env():
+    # Set RERANK=1 to rerank with a local cross-encoder (needs sentence-transformers)
+    if os.getenv("RERANK", "0") != "1":
+        return None
+    return CrossEncoderReranker(os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"))
+
+
+def overlap(a, b):
+    a, b = set(tokenize(a)), set(tokenize(b))
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25 and FAISS results fused with reciprocal rank fusion."""
+
+    vectorstore: Any
+    bm25: Any
+    k: int = 4
+    fetch_k: int = 20
+    rrf_k: int = 60
+    duplicate_overlap: float = 0.8
+    reranker: Optional[Any] = None
+
+    @classmethod
+    def from_index_store(cls, index_store, **kwargs):
+        index_store.check_not_empty()
+        kwargs.setdefault("reranker", reranker_from_env())
+        return cls(vectorstore=index_store.vectorstore, bm25=BM25Index(index_store.documents()), **kwargs)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        vector_hits = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        keyword_hits = self.bm25.search(query, self.fetch_k)
+
+        # Reciprocal rank fusion: only the rank in each list counts, so the
+        # different score scales of BM25 and L2 distance do not matter
+        scores = defaultdict(float)
+        documents = {}
+        for rank, doc in enumerate(vector_hits):
+            scores[doc.id] += 1 / (self.rrf_k + rank + 1)
+            documents[doc.id] = doc
+        for rank, (doc_id, _) in enumerate(keyword_hits):
+            scores[doc_id] += 1 / (self.rrf_k + rank + 1)
+
+        # The reranker gets a few more candidates than it has to return
+        limit = self.k * 3 if self.reranker else self.k
+        results = []
+        for doc_id in sorted(scores, key=scores.get, reverse=True):
+            doc = documents.get(doc_id) or self.vectorstore.docstore.search(doc_id)
+            if not isinstance(doc, Document):
+                continue
+            if any(overlap(doc.page_content, kept.page_content) >= self.duplicate_overlap for kept in results):
+                continue
+            results.append(doc)
+            if len(results) == limit:
+                break
+
+        if self.reranker:
+            results = self.reranker.rerank(query, results, self.k)
+        return results
@@ -3,6 +3,7 @@ from typing_extensions import TypedDict # typ
 from langgraph.graph import StateGraph, START, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 from fastapi import FastAPI
+from chat_server import add_chat_routes
 
 
 from dotenv import load_dotenv
@@ -18,9 +19,9 @@ class MessagesState(TypedDict):
     
 
 
-def assistant(state: MessagesState):
+async def assistant(state: MessagesState):
     print(state["user_input"])
-    return {"output": llm.invoke(state["user_input"])}
+    return {"output": await llm.ainvoke(state["user_input"])}
 
 # Build graph
 builder = StateGraph(MessagesState)
@@ -32,14 +33,8 @@ graph = builder.compile()
 
 app = FastAPI()
 
-@app.get("/chat/{query}")
-def get_content(query: str):
-    print(query)
-    try:
-        result = graph.invoke({"user_input": query})
-        return result
-    except Exception as e:
-        return {"output": str(e)}
+# Async /chat endpoints, this graph has no memory so the thread id is not used
+add_chat_routes(app, graph, make_input=lambda message: {"user_input": message})
 
 # poetry run uvicorn 02Langraph_FastApi:app --reload
 
@@ -6,10 +6,12 @@ from langgraph.graph.message import add_messages
 from langgraph.checkpoint.memory import MemorySaver
 from langchain_google_genai import ChatGoogleGenerativeAI
 from fastapi import FastAPI
+from chat_server import add_chat_routes
 from langchain_core.messages import HumanMessage, SystemMessage
 
 
 from dotenv import load_dotenv
+import asyncio
 import os
 load_dotenv()
 
@@ -21,8 +23,8 @@ class MessagesState(TypedDict):
     
 
 
-def assistant(state: MessagesState):
-    return {"messages": [llm.invoke(state["messages"])]}
+async def assistant(state: MessagesState):
+    return {"messages": [await llm.ainvoke(state["messages"])]}
 
 # Build graph
 builder = StateGraph(MessagesState)
@@ -32,24 +34,25 @@ builder.add_edge("assistant", END)
 checkpointer = MemorySaver()
 graph = builder.compile(checkpointer=checkpointer)
 
-while True:
+app = FastAPI()
+
+# Async /chat endpoints with a thread id per conversation and SSE streaming
+add_chat_routes(app, graph)
+
+# Chat in the terminal when the file is run directly (uvicorn only imports it)
+async def main():
+    # One event loop for the whole chat: the Gemini client keeps its
+    # connections on the loop it was first used on
+    while True:
         user_input = input("Enter your query: ")
         config = {"configurable": {"thread_id": "1", "user_id": "1"}}
-        messages = graph.invoke({"messages": HumanMessage(content=user_input)}, config)
+        messages = await graph.ainvoke({"messages": HumanMessage(content=user_input)}, config)
         for m in messages['messages']:
             print(m.content)
-            
-app = FastAPI()
 
-@app.get("/chat/{query}")
-def get_content(query: str):
-    print(query)
-    try:
-        config = {"configurable": {"thread_id": "1"}}
-        result = graph.invoke({"messages": [("user", query)]}, config)
-        return result
-    except Exception as e:
-        return {"output": str(e)}
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
 # poetry run uvicorn 02Langraph_FastApi:app --reload
 
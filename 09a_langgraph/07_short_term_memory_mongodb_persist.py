@@ -7,6 +7,7 @@ from langgraph.checkpoint.mongodb import MongoDBSaver
 from pymongo import MongoClient
 from langchain_google_genai import ChatGoogleGenerativeAI
 from fastapi import FastAPI
+from chat_server import add_chat_routes
 
 
 
@@ -22,8 +23,8 @@ class MessagesState(TypedDict):
     
 
 
-def assistant(state: MessagesState):
-    return {"messages": [llm.invoke(state["messages"])]}
+async def assistant(state: MessagesState):
+    return {"messages": [await llm.ainvoke(state["messages"])]}
 
 # Build graph
 builder = StateGraph(MessagesState)
@@ -37,15 +38,8 @@ graph = builder.compile(checkpointer=memory)
 
 app = FastAPI()
 
-@app.get("/chat/{query}")
-def get_content(query: str):
-    print(query)
-    try:
-        config = {"configurable": {"thread_id": "1"}}
-        result = graph.invoke({"messages": [("user", query)]}, config)
-        return result
-    except Exception as e:
-        return {"output": str(e)}
+# Async /chat endpoints with a thread id per conversation and SSE streaming
+add_chat_routes(app, graph)
 
 # poetry run uvicorn 02Langraph_FastApi:app --reload
 
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
+from chat_server import add_chat_routes
 from langchain_community.document_loaders import TextLoader
-from langchain_community.vectorstores import FAISS
 from langchain_openai import OpenAIEmbeddings
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import START, StateGraph, END
@@ -13,6 +13,8 @@ from dotenv import load_dotenv
 from langgraph.graph import MessagesState
 import os
 
+from rag_index import add_embedding_stats_route, build_retriever
+
 load_dotenv()
 
 llm = ChatOpenAI(openai_api_key=os.getenv("OPENAI_API_KEY"))
@@ -25,10 +27,7 @@ prompt = hub.pull("hwchase17/openai-tools-agent")
 text_splitter = CharacterTextSplitter(chunk_size=1500, chunk_overlap=50)
 texts = text_splitter.split_documents(documents)
 
-embeddings = OpenAIEmbeddings()
-
-db = FAISS.from_documents(texts, embeddings)
-retriever = db.as_retriever()
+retriever, embeddings = build_retriever(texts, OpenAIEmbeddings(), "faiss_index/hotel_openai")
 
 
 info_retriever = create_retriever_tool(
@@ -52,8 +51,8 @@ sys_msg = (
 )
 
 #defining assistant it will call the llm_with_tools with the last 10 messages
-def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"][-10:])]}
+async def assistant(state: MessagesState):
+    return {"messages": [await llm_with_tools.ainvoke([sys_msg] + state["messages"][-10:])]}
 
 #defining the nodes and edges of the graph
 builder = StateGraph(MessagesState)
@@ -72,12 +71,6 @@ agent = builder.compile(checkpointer=memory)
 
 app = FastAPI()
 
-@app.get("/chat/{query}")
-def get_content(query: str):
-    print(query)
-    try:
-        config = {"configurable": {"thread_id": "1"}}
-        result = agent.invoke({"messages": [("user", query)]}, config)
-        return result
-    except Exception as e:
-        return {"output": str(e)}
\ No newline at end of file
+# Async /chat endpoints with a thread id per conversation and SSE streaming
+add_chat_routes(app, agent)
+add_embedding_stats_route(app, embeddings)
@@ -3,12 +3,17 @@ from fastapi import FastAPI
 from sqlmodel import create_engine, SQLModel, Field, Session, select
 from contextlib import asynccontextmanager
 import os
+import sys
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import START, StateGraph, END
 from langgraph.prebuilt import tools_condition, ToolNode
 from langgraph.graph import MessagesState
 
+# chat_server.py lives one folder up
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from chat_server import add_chat_routes
+
 # Load environment variables
 load_dotenv()
 
@@ -150,8 +155,8 @@ Maintain a professional, polite, and helpful tone throughout your interactions.
 """
 
 # Assistant definition
-def assistant(state: MessagesState):
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"][-10:])]}
+async def assistant(state: MessagesState):
+    return {"messages": [await llm_with_tools.ainvoke([sys_msg] + state["messages"][-10:])]}
 
 # Graph nodes and edges
 builder = StateGraph(MessagesState)
@@ -168,13 +173,5 @@ memory = MemorySaver()
 # Build the graph
 agent = builder.compile(checkpointer=memory)
 
-# API for chatbot interaction
-@app.get("/chat/{query}")
-def get_content(query: str):
-    print(query)
-    try:
-        config = {"configurable": {"thread_id": "2"}}
-        result = agent.invoke({"messages": [("user", query)]}, config)
-        return result
-    except Exception as e:
-        return {"output": str(e)}
+# API for chatbot interaction (async, one conversation per thread id)
+add_chat_routes(app, agent)
@@ -1,5 +1,10 @@
 import streamlit as st
 import requests
+import uuid
+
+# Every browser session keeps its own conversation on the server
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = str(uuid.uuid4())
 
 # Set the title of the app
 st.title('Todo Chatbot')
@@ -12,7 +17,7 @@ if user_input:
     with st.spinner('Waiting for response...'):
         try:
             # Send the user input to your FastAPI chatbot
-            response = requests.get(f'http://127.0.0.1:8000/chat/{user_input}', headers={'accept': 'application/json'})
+            response = requests.get(f'http://127.0.0.1:8000/chat/{user_input}', headers={'accept': 'application/json', 'X-Thread-ID': st.session_state.thread_id})
             result = response.json()
 
             # Reverse the order of messages to display the newest at the top
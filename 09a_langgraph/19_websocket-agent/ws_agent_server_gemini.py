@@ -1,7 +1,6 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 from langchain_community.document_loaders import TextLoader
-from langchain_community.vectorstores import FAISS
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import START, StateGraph, END
@@ -12,9 +11,14 @@ from langchain import hub
 from langchain_core.messages import HumanMessage, AIMessageChunk
 from langgraph.graph import MessagesState
 import os
+import sys
 from dotenv import load_dotenv
 import asyncio
 
+# rag_index.py lives one folder up
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from rag_index import add_embedding_stats_route, build_retriever
+
 load_dotenv()
 
 # Initialize FastAPI app
@@ -29,9 +33,7 @@ prompt = hub.pull("hwchase17/openai-tools-agent")
 # Split texts and create retriever
 text_splitter = CharacterTextSplitter(chunk_size=1500, chunk_overlap=50)
 texts = text_splitter.split_documents(documents)
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-db = FAISS.from_documents(texts, embeddings)
-retriever = db.as_retriever()
+retriever, embeddings = build_retriever(texts, GoogleGenerativeAIEmbeddings(model="models/embedding-001"), "faiss_index/hotel_gemini")
 
 info_retriever = create_retriever_tool(
     retriever,
@@ -99,6 +101,8 @@ html = """
 async def get():
     return HTMLResponse(html)
 
+add_embedding_stats_route(app, embeddings)
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
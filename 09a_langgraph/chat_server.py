@@ -0,0 +1,183 @@
+"""Async chat endpoints shared by the LangGraph FastAPI examples.
+
+add_chat_routes(app, graph) adds:
+
+    GET  /chat/{query}   run the graph and return the final state (as before)
+    POST /chat           {"message": "...", "thread_id": "..."}, returns the final state
+    POST /chat/stream    same body, streams the answer as Server-Sent Events
+
+Every conversation has its own thread id, taken from the request body, the
+thread_id query parameter or the X-Thread-ID header. Without one a new id is
+created and sent back in the X-Thread-ID header (and in the result), so the
+client can continue the same conversation.
+
+Graphs run with ainvoke/astream on the event loop instead of holding a
+threadpool worker for the whole LLM call. At most MAX_CONCURRENT_CHATS run at
+once (others wait up to CHAT_QUEUE_TIMEOUT seconds, then get a 503), and a run
+is cancelled as soon as its client disconnects.
+"""
+import asyncio
+import json
+import os
+import uuid
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+MAX_CONCURRENT_CHATS = int(os.getenv("MAX_CONCURRENT_CHATS", "20"))
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class ChatRequest(BaseModel):
+    message: str
+    thread_id: Optional[str] = None
+
+
+def messages_input(message):
+    # Input for graphs with a MessagesState
+    return {"messages": [("user", message)]}
+
+
+class ChatLimiter:
+    """Limits how many graph runs are in progress at the same time."""
+
+    def __init__(self, limit=MAX_CONCURRENT_CHATS, timeout=CHAT_QUEUE_TIMEOUT):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.timeout = timeout
+        self.active = 0
+
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Too many chats in progress, try again later")
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        self.semaphore.release()
+
+
+class SlotStreamingResponse(StreamingResponse):
+    """StreamingResponse that gives its chat slot back however the response
+    ends, also when the client leaves before the body is iterated (the
+    generator's finally and a BackgroundTask do not run then)."""
+
+    def __init__(self, content, release, **kwargs):
+        super().__init__(content, **kwargs)
+        self.release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.release()
+
+
+async def run_until_disconnect(request, coro):
+    # Run the graph as a task and cancel it when the client goes away
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def add_chat_routes(app, graph, make_input=messages_input, stream_node="assistant"):
+    """Add the chat endpoints for graph to app.
+
+    make_input turns the user's message into the graph input. Only tokens from
+    the stream_node node are streamed, so tool calls and tool output are not
+    sent to the client.
+    """
+    limiter = ChatLimiter()
+
+    async def run_chat(request, response, message, thread_id):
+        thread_id = thread_id or str(uuid.uuid4())
+        response.headers["X-Thread-ID"] = thread_id
+        config = {"configurable": {"thread_id": thread_id}}
+
+        await limiter.acquire()
+        try:
+            result = await run_until_disconnect(request, graph.ainvoke(make_input(message), config))
+        except HTTPException:
+            raise
+        except Exception as e:
+            return {"output": str(e), "thread_id": thread_id}
+        finally:
+            limiter.release()
+        return {**result, "thread_id": thread_id}
+
+    @app.get("/chat/{query}")
+    async def chat_query(
+        query: str,
+        request: Request,
+        response: Response,
+        thread_id: Optional[str] = None,
+        x_thread_id: Optional[str] = Header(None),
+    ):
+        return await run_chat(request, response, query, thread_id or x_thread_id)
+
+    @app.post("/chat")
+    async def chat(
+        body: ChatRequest,
+        request: Request,
+        response: Response,
+        x_thread_id: Optional[str] = Header(None),
+    ):
+        return await run_chat(request, response, body.message, body.thread_id or x_thread_id)
+
+    @app.post("/chat/stream")
+    async def chat_stream(
+        body: ChatRequest,
+        request: Request,
+        x_thread_id: Optional[str] = Header(None),
+    ):
+        thread_id = body.thread_id or x_thread_id or str(uuid.uuid4())
+        config = {"configurable": {"thread_id": thread_id}}
+        # Wait for a slot before the response starts, so a full server can still answer 503
+        await limiter.acquire()
+
+        async def events():
+            stream = graph.astream(make_input(body.message), config, stream_mode="messages")
+            try:
+                yield sse("thread", {"thread_id": thread_id})
+                async for chunk, metadata in stream:
+                    if await request.is_disconnected():
+                        return
+                    if not isinstance(chunk, AIMessage) or not chunk.content:
+                        continue
+                    if stream_node and metadata.get("langgraph_node") != stream_node:
+                        continue
+                    yield sse("token", {"content": chunk.content})
+                yield sse("done", {})
+            except Exception as e:
+                yield sse("error", {"message": str(e)})
+            finally:
+                # Closing the stream cancels the graph run if it is still going
+                await stream.aclose()
+
+        return SlotStreamingResponse(
+            events(),
+            limiter.release,
+            media_type="text/event-stream",
+            headers={"X-Thread-ID": thread_id, "Cache-Control": "no-cache"},
+        )
+
+    @app.get("/chat_stats")
+    async def chat_stats():
+        return {"active_chats": limiter.active, "max_concurrent_chats": MAX_CONCURRENT_CHATS}
@@ -0,0 +1,33 @@
+"""Hotel retriever shared by the LangGraph RAG examples.
+
+build_retriever() wraps the embeddings in the embedding cache, so repeated
+questions are not embedded again, syncs the chunks into a FAISS index saved in
+directory, so only new chunks are embedded, and returns a BM25 + vector hybrid
+retriever over it. The building blocks live in 09_langchain.
+
+    retriever, embeddings = build_retriever(texts, OpenAIEmbeddings(), "faiss_index/hotel_openai")
+    add_embedding_stats_route(app, embeddings)
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "09_langchain"))
+from embedding_cache import CachedEmbeddings
+from faiss_index import FaissIndexStore
+from hybrid_retriever import HybridRetriever
+
+
+def build_retriever(documents, embeddings, directory, k=3):
+    """Return (retriever, cached embeddings) for the given chunks."""
+    embeddings = CachedEmbeddings(embeddings)
+    index_store = FaissIndexStore(directory, embeddings)
+    index_store.sync(documents)
+    return HybridRetriever.from_index_store(index_store, k=k), embeddings
+
+
+def add_embedding_stats_route(app, embeddings):
+    """Add GET /embedding_stats with the hits and misses of the embedding cache."""
+
+    @app.get("/embedding_stats")
+    async def embedding_stats():
+        return embeddings.stats()